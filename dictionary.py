@@ -1,70 +1,15 @@
-import json
-import math
+'''Word lists, difficulty settings and scoring for the Hangman game. Importing it has no side effects: nothing is read or
+written, the word tables are only built the first time words_data or game_data is used, and dictionary.json is generated
+by an explicit build command (python dictionary.py build)'''
 
-# Unique words and phrases for each difficulty level
-words_data = {
-    "easy": [
-        "apple", "banana", "cat", "dog", "elephant", "fish", "grape", "house", "ice", "juice",
-        "kite", "lemon", "mango", "nest", "orange", "pear", "queen", "rabbit", "sun", "tree",
-        "umbrella", "van", "water", "xylophone", "yogurt", "zebra", "ant", "bird", "car", "duck",
-        "egg", "frog", "goat", "hat", "ink", "jump", "kitten", "lion", "moon", "owl", "pig",
-        "quail", "rose", "ship", "tiger", "unicorn", "vase", "whale", "yarn", "zoo"
-    ],
-    "medium": [
-        "ambition", "breeze", "cascade", "dazzle", "echo", "flourish", "glimmer", "harbor", "illusion", "jubilee",
-        "kaleidoscope", "luminous", "mystic", "nectar", "oasis", "pinnacle", "quasar", "radiant", "serene", "tranquil",
-        "utopia", "vivid", "whisper", "xenon", "yearn", "zenith", "alchemy", "benevolent", "crescendo", "dynamo",
-        "effervescent", "finesse", "gossamer", "halcyon", "incandescent", "jovial", "kismet", "labyrinth", "mellifluous",
-        "nostalgia", "oblivion", "paradox", "quintessence", "resplendent", "symphony", "talisman", "umbra", "verisimilitude",
-        "whimsical", "xylography"
-    ],
-    "hard": [
-        "abstruse", "belligerent", "cogent", "debilitate", "ebullient", "facetious", "gregarious", "harangue", "iconoclast", "juxtapose",
-        "knavery", "languid", "mendacious", "nefarious", "obfuscate", "perfidious", "quixotic", "recalcitrant", "sagacious", "taciturn",
-        "ubiquitous", "vacuous", "winsome", "xeric", "yoke", "zealous", "abrogate", "bellicose", "cogitate", "deleterious", "ebullience",
-        "facetiousness", "gregariousness", "harangue", "iconoclastic", "juxtaposition", "knavery", "languor", "mendacity", "nefariousness",
-        "obfuscation", "perfidy", "quixotism", "recalcitrance", "sagacity", "taciturnity", "ubiquity", "vacuity", "winsomeness", "xerophyte"
-    ],
-    "challenger": [
-        "thermostat calibration", "kaleidoscope patterns", "ventriloquist performance", "parallelogram geometry", "quintessential example",
-        "sophisticated technology", "unprecedented event", "xylophonist musician", "zoological studies", "bibliography compilation",
-        "cryptography algorithm", "demographic analysis", "electromagnetic spectrum", "fluorescence effect", "geopolitical strategy",
-        "hydroelectric power", "idiosyncratic behavior", "jurisprudence principles", "lexicography techniques", "metamorphosis process",
-        "neuroplasticity research", "oscilloscope measurements", "quintessential example", "sophisticated technology", "unprecedented event",
-        "thermodynamic equilibrium", "astrobiological research", "nanotechnological advancements", "epidemiological modeling", "pharmacokinetic properties",
-        "geopolitical instability", "meteorological phenomena", "psycholinguistic analysis", "socioeconomic disparities", "immunological responses",
-        "paleontological discoveries", "astrophysical observations", "biotechnological innovations", "cryptocurrency mining", "epidemiological surveillance",
-        "neuropharmacological effects", "radiocarbon dating", "spectroscopic analysis", "thermonuclear reactions", "algorithmic complexity",
-        "biomechanical engineering", "cryptographic protocols", "thermodynamic equilibrium", "astrobiological research", "nanotechnological advancements"
-    ],
-    "master": [
-        "quantum entanglement theory", "neuroplasticity mechanisms research", "electromagnetic radiation spectrum",
-        "algorithmic complexity analysis", "biomechanical engineering principles", "cryptographic protocols design",
-        "thermodynamic equilibrium states", "astrobiological research findings", "nanotechnological advancements overview",
-        "epidemiological modeling techniques", "pharmacokinetic properties analysis", "geopolitical instability factors",
-        "meteorological phenomena forecasting", "psycholinguistic analysis methods", "socioeconomic disparities impact",
-        "immunological responses study", "paleontological discoveries report", "astrophysical observations summary",
-        "biotechnological innovations review", "cryptocurrency mining operations", "epidemiological surveillance systems",
-        "neuropharmacological effects research", "radiocarbon dating techniques", "spectroscopic analysis methods",
-        "thermonuclear reactions study", "quantum computing advancements", "neuroplasticity research insights",
-        "electromagnetic spectrum analysis", "algorithmic efficiency optimization", "biomechanical systems design",
-        "cryptographic security protocols", "thermodynamic principles exploration", "astrobiological discoveries update",
-        "nanotechnological applications review", "epidemiological studies summary", "pharmacokinetic modeling techniques",
-        "geopolitical strategies analysis", "meteorological forecasting models", "psycholinguistic research findings",
-        "socioeconomic policies impact", "immunological therapies development", "paleontological excavations report",
-        "astrophysical theories exploration", "biotechnological breakthroughs overview", "cryptocurrency trading strategies",
-        "epidemiological investigations summary", "neuropharmacological studies review", "radiocarbon analysis techniques",
-        "spectroscopic techniques overview", "thermonuclear fusion research"
-    ]
-}
+import math
 
-# Add metadata and scoring parameters for each difficulty level
-game_data = {
+# Metadata and scoring parameters for each difficulty level (game_data adds each level's words or phrases)
+DIFFICULTY_DATA = {
     "easy": {
         "attempts": 9,
         "time_limit_minutes": 10,
         "word_length": "5-8 letters",
-        "words": words_data["easy"],
         "scoring": {
             "time_value": 1/50,  # Points per second saved
             "guess_penalty": 1,  # Points lost per incorrect guess
@@ -75,7 +20,6 @@ game_data = {
         "attempts": 8,
         "time_limit_minutes": 9,
         "word_length": "8-11 letters",
-        "words": words_data["medium"],
         "scoring": {
             "time_value": 1/20,
             "guess_penalty": 1,
@@ -86,7 +30,6 @@ game_data = {
         "attempts": 7,
         "time_limit_minutes": 8,
         "word_length": "11-15 letters",
-        "words": words_data["hard"],
         "scoring": {
             "time_value": 1/15,
             "guess_penalty": 1,
@@ -97,7 +40,6 @@ game_data = {
         "attempts": 6,
         "time_limit_minutes": 7,
         "word_length": "15-20 letters",
-        "phrases": words_data["challenger"],
         "scoring": {
             "time_value": 1/12,
             "guess_penalty": 1,
@@ -108,7 +50,6 @@ game_data = {
         "attempts": 5,
         "time_limit_minutes": 6,
         "word_length": "15-25 letters",
-        "phrases": words_data["master"],
         "scoring": {
             "time_value": 1/10,
             "guess_penalty": 1,
@@ -117,10 +58,95 @@ game_data = {
     }
 }
 
+# Easy, medium and hard use single words, the harder levels use phrases
+LIST_KEYS = {"easy": "words", "medium": "words", "hard": "words", "challenger": "phrases", "master": "phrases"}
+
+
+def _build_words_data():
+    """Words and phrases for each difficulty level (build() drops the few duplicates)."""
+    return {
+        "easy": [
+            "apple", "banana", "cat", "dog", "elephant", "fish", "grape", "house", "ice", "juice",
+            "kite", "lemon", "mango", "nest", "orange", "pear", "queen", "rabbit", "sun", "tree",
+            "umbrella", "van", "water", "xylophone", "yogurt", "zebra", "ant", "bird", "car", "duck",
+            "egg", "frog", "goat", "hat", "ink", "jump", "kitten", "lion", "moon", "owl", "pig",
+            "quail", "rose", "ship", "tiger", "unicorn", "vase", "whale", "yarn", "zoo"
+        ],
+        "medium": [
+            "ambition", "breeze", "cascade", "dazzle", "echo", "flourish", "glimmer", "harbor", "illusion", "jubilee",
+            "kaleidoscope", "luminous", "mystic", "nectar", "oasis", "pinnacle", "quasar", "radiant", "serene", "tranquil",
+            "utopia", "vivid", "whisper", "xenon", "yearn", "zenith", "alchemy", "benevolent", "crescendo", "dynamo",
+            "effervescent", "finesse", "gossamer", "halcyon", "incandescent", "jovial", "kismet", "labyrinth", "mellifluous",
+            "nostalgia", "oblivion", "paradox", "quintessence", "resplendent", "symphony", "talisman", "umbra", "verisimilitude",
+            "whimsical", "xylography"
+        ],
+        "hard": [
+            "abstruse", "belligerent", "cogent", "debilitate", "ebullient", "facetious", "gregarious", "harangue", "iconoclast", "juxtapose",
+            "knavery", "languid", "mendacious", "nefarious", "obfuscate", "perfidious", "quixotic", "recalcitrant", "sagacious", "taciturn",
+            "ubiquitous", "vacuous", "winsome", "xeric", "yoke", "zealous", "abrogate", "bellicose", "cogitate", "deleterious", "ebullience",
+            "facetiousness", "gregariousness", "harangue", "iconoclastic", "juxtaposition", "knavery", "languor", "mendacity", "nefariousness",
+            "obfuscation", "perfidy", "quixotism", "recalcitrance", "sagacity", "taciturnity", "ubiquity", "vacuity", "winsomeness", "xerophyte"
+        ],
+        "challenger": [
+            "thermostat calibration", "kaleidoscope patterns", "ventriloquist performance", "parallelogram geometry", "quintessential example",
+            "sophisticated technology", "unprecedented event", "xylophonist musician", "zoological studies", "bibliography compilation",
+            "cryptography algorithm", "demographic analysis", "electromagnetic spectrum", "fluorescence effect", "geopolitical strategy",
+            "hydroelectric power", "idiosyncratic behavior", "jurisprudence principles", "lexicography techniques", "metamorphosis process",
+            "neuroplasticity research", "oscilloscope measurements", "quintessential example", "sophisticated technology", "unprecedented event",
+            "thermodynamic equilibrium", "astrobiological research", "nanotechnological advancements", "epidemiological modeling", "pharmacokinetic properties",
+            "geopolitical instability", "meteorological phenomena", "psycholinguistic analysis", "socioeconomic disparities", "immunological responses",
+            "paleontological discoveries", "astrophysical observations", "biotechnological innovations", "cryptocurrency mining", "epidemiological surveillance",
+            "neuropharmacological effects", "radiocarbon dating", "spectroscopic analysis", "thermonuclear reactions", "algorithmic complexity",
+            "biomechanical engineering", "cryptographic protocols", "thermodynamic equilibrium", "astrobiological research", "nanotechnological advancements"
+        ],
+        "master": [
+            "quantum entanglement theory", "neuroplasticity mechanisms research", "electromagnetic radiation spectrum",
+            "algorithmic complexity analysis", "biomechanical engineering principles", "cryptographic protocols design",
+            "thermodynamic equilibrium states", "astrobiological research findings", "nanotechnological advancements overview",
+            "epidemiological modeling techniques", "pharmacokinetic properties analysis", "geopolitical instability factors",
+            "meteorological phenomena forecasting", "psycholinguistic analysis methods", "socioeconomic disparities impact",
+            "immunological responses study", "paleontological discoveries report", "astrophysical observations summary",
+            "biotechnological innovations review", "cryptocurrency mining operations", "epidemiological surveillance systems",
+            "neuropharmacological effects research", "radiocarbon dating techniques", "spectroscopic analysis methods",
+            "thermonuclear reactions study", "quantum computing advancements", "neuroplasticity research insights",
+            "electromagnetic spectrum analysis", "algorithmic efficiency optimization", "biomechanical systems design",
+            "cryptographic security protocols", "thermodynamic principles exploration", "astrobiological discoveries update",
+            "nanotechnological applications review", "epidemiological studies summary", "pharmacokinetic modeling techniques",
+            "geopolitical strategies analysis", "meteorological forecasting models", "psycholinguistic research findings",
+            "socioeconomic policies impact", "immunological therapies development", "paleontological excavations report",
+            "astrophysical theories exploration", "biotechnological breakthroughs overview", "cryptocurrency trading strategies",
+            "epidemiological investigations summary", "neuropharmacological studies review", "radiocarbon analysis techniques",
+            "spectroscopic techniques overview", "thermonuclear fusion research"
+        ]
+    }
+
+
+def _build_game_data():
+    """Every difficulty level's metadata with its words or phrases, in the layout of dictionary.json."""
+    words = __getattr__("words_data")
+    game_data = {}
+    for difficulty, settings in DIFFICULTY_DATA.items():
+        tier = {key: value for key, value in settings.items() if key != "scoring"}
+        tier[LIST_KEYS[difficulty]] = words[difficulty]
+        tier["scoring"] = settings["scoring"]
+        game_data[difficulty] = tier
+    return game_data
+
+
+_LAZY = {"words_data": _build_words_data, "game_data": _build_game_data}
+
+
+def __getattr__(name):
+    """Build words_data and game_data on first access, then keep them as ordinary module attributes."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = _LAZY[name]()
+    return value
+
 
 def calculate_score(difficulty, time_used_seconds, incorrect_guesses):
     """Calculate score based on game parameters"""
-    params = game_data[difficulty.lower()]
+    params = DIFFICULTY_DATA[difficulty.lower()]
     scoring = params["scoring"]
     
     # Calculate time saved (cannot be negative)
@@ -151,15 +177,75 @@ def calculate_score(difficulty, time_used_seconds, incorrect_guesses):
         "total_score": total_score
     }
 
-# Save the dictionary as a JSON file
-with open('dictionary.json', 'w') as json_file:
-    json.dump(game_data, json_file, indent=4)
 
-print("Enhanced dictionary saved as dictionary.json")
+def build(output="dictionary.json", pack=None):
+    """Write game_data to dictionary.json (and optionally a word pack), deduped and validated by word_pack."""
+    import json
+
+    from word_pack import compile_dictionary, write_word_pack
+
+    compiled, errors, warnings = compile_dictionary(__getattr__("game_data"))
+    for problem in errors + warnings:
+        print(problem)
+    with open(output, "w") as json_file:
+        json.dump(compiled, json_file, indent=4)
+    print(f"Enhanced dictionary saved as {output}")
+    if pack:
+        write_word_pack(pack, compiled)
+        print(f"Word pack saved as {pack}")
+
+
+def _import_benchmark(runs=20):
+    """Time `import dictionary` in fresh interpreters, and check that importing it creates no files."""
+    import os
+    import re
+    import subprocess
+    import sys
+    import tempfile
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    directory = tempfile.mkdtemp()
+    # Bytecode is cached outside the working directory, and the first (compiling) run is not counted
+    environment = dict(os.environ, PYTHONPATH=here, PYTHONPYCACHEPREFIX=tempfile.mkdtemp())
+    environment.pop("PYTHONDONTWRITEBYTECODE", None)
+    import_times = []
+    for _ in range(runs + 1):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import dictionary"],
+            cwd=directory, env=environment, capture_output=True, text=True, check=True
+        )
+        # -X importtime reports "import time: self [us] | cumulative | imported package"
+        import_times.append(int(re.search(r"\|\s*(\d+) \| dictionary$", result.stderr, re.MULTILINE).group(1)))
+
+    first_use = subprocess.run(
+        [sys.executable, "-c", "import time, dictionary; start = time.perf_counter(); dictionary.game_data; "
+                               "print((time.perf_counter() - start) * 1e6)"],
+        cwd=directory, env=environment, capture_output=True, text=True, check=True
+    )
+    import_times = sorted(import_times[1:])
+    print(f"import dictionary: median {import_times[runs // 2]} us over {runs} runs")
+    print(f"first use of game_data: {float(first_use.stdout):.0f} us")
+    print(f"files written by importing: {len(os.listdir(directory))}")
+
 
 # Example usage:
 if __name__ == "__main__":
-    example_score = calculate_score("master", 175, 3)  # 2m55s used, 3 incorrect guesses
-    print("\nExample Score Calculation (Master Difficulty):")
-    for key, value in example_score.items():
-        print(f"{key.replace('_', ' ').title()}: {value}")
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Hangman word lists and scoring")
+    commands = parser.add_subparsers(dest="command")
+    build_command = commands.add_parser("build", help="write dictionary.json (and a word pack with --pack)")
+    build_command.add_argument("--output", default="dictionary.json")
+    build_command.add_argument("--pack", help="also write a word pack (see word_pack.py) to this path")
+    commands.add_parser("bench", help="measure the import time of this module")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build(args.output, args.pack)
+    elif args.command == "bench":
+        _import_benchmark()
+    else:
+        example_score = calculate_score("master", 175, 3)  # 2m55s used, 3 incorrect guesses
+        print("\nExample Score Calculation (Master Difficulty):")
+        for key, value in example_score.items():
+            print(f"{key.replace('_', ' ').title()}: {value}")
@@ -0,0 +1,114 @@
+'''Local stand-in for the Gemini REST API (generateContent and streamGenerateContent), used to load test the game
+and run it offline. Point the game at it with GEMINI_BASE_URL=http://127.0.0.1:8765'''
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_reply(prompt):
+    """A canned reply that looks enough like the real thing for the game's prompts."""
+    if "definition" in prompt:
+        return "It's something you would find in everyday life, think carefully about what it's used for."
+    if "letter" in prompt:
+        return "Try the letter 'e'."
+    if "sentence" in prompt:
+        return "Yesterday I saw a ____ on my way to work and couldn't stop thinking about it."
+    if "Taunt" in prompt or "mock" in prompt:
+        return "Ready or not, here it comes, and you don't look ready!"
+    return "You can do this, show that word who is boss!"
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive like the real endpoint
+    disable_nagle_algorithm = True  # Headers and body are separate writes, don't let them wait on delayed ACKs
+    latency = 0.0        # Seconds to wait before answering (set by serve())
+    chunk_delay = 0.0    # Seconds between streamed chunks
+    failure_rate = 0.0   # Share of requests answered with 503 Service Unavailable
+    requests_served = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _prompt(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        contents = body.get("contents", [])
+        return " ".join(part.get("text", "") for content in contents for part in content.get("parts", []))
+
+    def _send(self, status, payload, content_type="application/json"):
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # The client gave up waiting (a deadline or a cancelled request)
+
+    def do_POST(self):
+        prompt = self._prompt()
+        type(self).requests_served += 1
+        time.sleep(self.latency)
+        if random.random() < self.failure_rate:
+            self._send(503, {"error": {"code": 503, "message": "The model is overloaded.", "status": "UNAVAILABLE"}})
+            return
+        text = fake_reply(prompt)
+
+        if ":streamGenerateContent" in self.path:
+            # Server-sent events, one candidate chunk per word
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            words = text.split(" ")
+            try:
+                for i, word in enumerate(words):
+                    chunk = word if i == len(words) - 1 else word + " "
+                    event = f"data: {json.dumps(_response(chunk))}\r\n\r\n".encode()
+                    self.wfile.write(f"{len(event):x}\r\n".encode() + event + b"\r\n")
+                    self.wfile.flush()
+                    time.sleep(self.chunk_delay)
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True  # The client stopped reading (a cancelled request)
+        elif ":generateContent" in self.path:
+            time.sleep(self.chunk_delay * len(text.split(" ")))  # The whole reply is generated before any of it is sent
+            self._send(200, _response(text))
+        else:
+            self._send(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+
+
+def _response(text):
+    return {
+        "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP", "index": 0}],
+        "modelVersion": "fake-gemini"
+    }
+
+
+def serve(host="127.0.0.1", port=8765, latency=0.0, chunk_delay=0.0, background=False, failure_rate=0.0):
+    """Start the fake API, in a daemon thread when background is set (returns the server either way)."""
+    handler = type("Handler", (FakeGeminiHandler,), {"latency": latency, "chunk_delay": chunk_delay, "failure_rate": failure_rate})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    if background:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    else:
+        server.serve_forever()
+    return server
+
+
+if __name__ == "__main__":
+    # if you directly run this file it will serve the fake API until interrupted:
+    parser = argparse.ArgumentParser(description="Local stand-in for the Gemini API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each reply")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="seconds between streamed chunks")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of requests answered with 503")
+    args = parser.parse_args()
+    print(f"Fake Gemini listening on http://{args.host}:{args.port}")
+    serve(args.host, args.port, args.latency, args.chunk_delay, failure_rate=args.failure_rate)
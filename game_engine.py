@@ -0,0 +1,372 @@
+'''Headless game engine: every HangmanGame session lives behind an async, I/O-free API (create a session, submit an action,
+get back a message plus the new state) so thousands of games can share one asyncio event loop. The terminal game and any
+other front-end are thin clients of this engine'''
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+
+from gemini_scheduler import COSMETIC, IN_TURN, SPECULATIVE
+from hangman_game import DIFFICULTY_LEVELS, DIFFICULTY_SETTINGS, DIFFICULTY_TIME, HINT_TYPES, LETTER_HINT, HangmanGame, choose_word, gemini_prompt, gemini_response_cache, gemini_scheduler, packed_hint, warm_up_gemini
+
+ACTIONS = ("start", "letter", "word", "hint", "resign", "timeout")
+
+
+class GeminiReply:
+    """One prompt's reply, streamed into a buffer so whoever asks for it gets it from the first chunk, whether it is
+    still on its way or long complete. The full text is the result of .task (None if the scheduler shed the request)."""
+
+    def __init__(self, prompt, priority=IN_TURN):
+        self.prompt = prompt
+        self.priority = priority
+        self.chunks = []
+        self.complete = False
+        self._changed = asyncio.Event()
+        self.task = asyncio.get_running_loop().create_task(self._fetch(prompt, priority))
+
+    @property
+    def shed(self):
+        return self.task.done() and not self.task.cancelled() and self.task.result() is None
+
+    async def _fetch(self, prompt, priority):
+        try:
+            return await gemini_prompt(prompt, on_chunk=self._append, priority=priority)
+        finally:
+            self.complete = True
+            self._changed.set()
+
+    def _append(self, chunk):
+        self.chunks.append(chunk)
+        self._changed.set()
+
+    async def follow(self):
+        """Yield every chunk from the first, waiting for the rest until the reply is complete."""
+        sent = 0
+        while True:
+            while sent < len(self.chunks):
+                yield self.chunks[sent]
+                sent += 1
+            if self.complete:
+                return
+            self._changed.clear()
+            await self._changed.wait()
+
+
+class GameSession:
+    """One player's game plus the bookkeeping the engine needs to serve it."""
+
+    def __init__(self, session_id, game):
+        self.session_id = session_id
+        self.game = game
+        self.notices = []  # Messages produced between actions (e.g. a deadline firing on the timer wheel)
+        self.last_active = time.time()
+        self.stats_saved = False
+        self.lock = asyncio.Lock()  # One action at a time per session
+        self.prefetched = {}  # Prompt -> GeminiReply already on its way
+
+    def close(self):
+        """Disarm the deadlines and stop asking Gemini for replies nobody will read."""
+        self.game.cancel_timers()
+        for reply in self.prefetched.values():
+            reply.task.cancel()
+        self.prefetched.clear()
+
+
+class SessionStore:
+    """Sessions keyed by id, kept in least recently active order so idle ones are evicted cheaply."""
+
+    def __init__(self, max_sessions=None, idle_timeout=None, on_evict=None):
+        self.max_sessions = max_sessions  # None means unbounded
+        self.idle_timeout = idle_timeout  # Seconds without an action before a session is dropped
+        self.on_evict = on_evict
+        self._sessions = OrderedDict()
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, session_id):
+        return session_id in self._sessions
+
+    def get(self, session_id):
+        """Look a session up and mark it as the most recently active."""
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_active = time.time()
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def add(self, session):
+        self.evict_idle()
+        # Make room by dropping the least recently active sessions
+        while self.max_sessions is not None and len(self._sessions) >= self.max_sessions:
+            self._evict(next(iter(self._sessions)))
+        self._sessions[session.session_id] = session
+
+    def pop(self, session_id, default=None):
+        return self._sessions.pop(session_id, default)
+
+    def _evict(self, session_id):
+        session = self._sessions.pop(session_id)
+        self.evicted += 1
+        if self.on_evict is not None:
+            self.on_evict(session)
+
+    def evict_idle(self, now=None):
+        """Drop every session idle for longer than idle_timeout (only the oldest end of the order is inspected)."""
+        if self.idle_timeout is None:
+            return
+        cutoff = (now or time.time()) - self.idle_timeout
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_active > cutoff:
+                break
+            self._evict(session_id)
+
+
+class GameEngine:
+    """Runs any number of game sessions on one event loop."""
+
+    def __init__(self, wheel=None, max_sessions=None, idle_timeout=None, words_dictionary=None, high_score_lookup=None, stats_writer=None, session_prefix="", on_notice=None, on_stream=None):
+        self.sessions = SessionStore(max_sessions, idle_timeout, on_evict=GameSession.close)
+        # Optional shared TimerWheel that enforces turn and game deadlines server-side,
+        # without one the client reports turn timeouts itself (the "timeout" action)
+        self.wheel = wheel
+        self.words_dictionary = words_dictionary  # Fixed word lists for every session (the shared, hot-reloaded dictionary if None)
+        self.high_score_lookup = high_score_lookup  # name -> high score from an in-memory copy of the stats (read per game if None)
+        self.stats_writer = stats_writer  # Hands finished games' stats records to a single writer (saved in-process if None)
+        self.session_prefix = session_prefix  # Lets a dispatcher tell which engine a session id belongs to
+        self.on_notice = on_notice  # (session_id, message) -> None, pushes notices as they happen instead of with the next result
+        self.on_stream = on_stream  # (session_id, chunk) -> None, renders hints and resignations as Gemini's text streams in
+        self.loop = None
+
+    def status(self):
+        return {
+            "sessions": len(self.sessions),
+            "evicted": self.sessions.evicted,
+            "gemini_cache": gemini_response_cache().stats(),
+            "gemini_scheduler": gemini_scheduler(self.loop).stats() if self.loop is not None else None
+        }
+
+    def _session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise KeyError(f"Unknown game session '{session_id}'")
+        return session
+
+    async def create_session(self, name, difficulty, word=None):
+        """Set up a game for the player, a random word is chosen unless one is given (creator mode)."""
+        self.loop = asyncio.get_running_loop()
+        if difficulty not in DIFFICULTY_LEVELS.values():
+            raise ValueError(f"Unknown difficulty '{difficulty}'")
+
+        name = name.strip() or "Hangman Player"
+        warm_up_gemini()  # The game's first Gemini call comes right after this
+
+        # The dictionary is cached in memory (at most a stat of its file), the player's high score may touch the disk
+        if word is None:
+            word = choose_word(difficulty, self.words_dictionary)
+        settings = (
+            name, word, difficulty,
+            DIFFICULTY_SETTINGS[difficulty]["attempts"],
+            DIFFICULTY_TIME[difficulty]["game_time_limit"],
+            DIFFICULTY_TIME[difficulty]["turn_time_limit"]
+        )
+        if self.high_score_lookup is not None:
+            game = HangmanGame(*settings, high_score=self.high_score_lookup(name))
+        else:
+            game = await asyncio.to_thread(HangmanGame, *settings)
+
+        session = GameSession(self.session_prefix + uuid.uuid4().hex, game)
+        self.sessions.add(session)
+        self._prefetch(session)
+        return session.session_id, self.snapshot(session)
+
+    def close_session(self, session_id):
+        """Forget a session and disarm its deadlines."""
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            session.close()
+
+    def _notify(self, session, message):
+        """TimerWheel callbacks (and late Gemini replies) report here, the next result hands the messages to the client."""
+        if self.on_notice is not None:
+            self.on_notice(session.session_id, message)
+        else:
+            session.notices.append(message)
+        if session.game.game_finished()[0] and self.loop is not None:
+            self.loop.call_soon_threadsafe(lambda: self.loop.create_task(self._settle(session)))
+
+    async def _settle(self, session):
+        """Save the player's stats (once) when their game is over."""
+        finished, outcome = session.game.game_finished()
+        if finished and not session.stats_saved:
+            session.stats_saved = True
+            if self.stats_writer is not None:
+                self.stats_writer(session.game.stats_record())
+            else:
+                await asyncio.to_thread(session.game.save_player_stats)
+        return finished, outcome
+
+    def snapshot(self, session):
+        """Everything a client needs to render the game, the secret word is only revealed in the outcome."""
+        game = session.game
+        finished, outcome = game.game_finished()
+        return {
+            "session_id": session.session_id,
+            "name": game.name,
+            "difficulty": game.difficulty,
+            "word": game.word_display(),
+            "hangman": game.hangman_display(),
+            "guessed_letters": sorted(game.guessed_letters),
+            "valid_letters": sorted(game.valid_letters),
+            "vetoed_letters": sorted(game.vetoed_letters),
+            "guessed_phrases": list(game.guessed_phrases),
+            "remaining_attempts": game.remaining_attempts,
+            "remaining_time": game.get_remaining_time(),
+            "turn_time_limit": game.turn_time_limit,
+            "current_score": game.current_score,
+            "high_score": game.high_score,
+            "outstanding_score": game.outstanding_score,
+            "hints_used": game.hints_used,
+            "max_hints": game.max_hints,
+            "hint_unavailable": game.hint_unavailable(),
+            "finished": finished,
+            "outcome": outcome
+        }
+
+    def _result(self, session, message):
+        notices, session.notices = session.notices, []
+        return {"message": message, "notices": notices, "state": self.snapshot(session)}
+
+    async def get_state(self, session_id):
+        """Current state of a session (settling it first if the clock ran out)."""
+        session = self._session(session_id)
+        await self._settle(session)
+        return self._result(session, None)
+
+    async def submit(self, session_id, action, value=None):
+        """Apply one player action and return {"message", "notices", "state"}."""
+        session = self._session(session_id)
+        game = session.game
+
+        async with session.lock:
+            finished, outcome = await self._settle(session)
+            if finished:
+                return self._result(session, outcome)
+
+            # The player acted, so this turn is over
+            game.end_turn_timer()
+
+            if action == "start":
+                message = await self._start(session)
+            elif action == "letter":
+                letter = (value or "").lower().strip()
+                if len(letter) != 1 or not letter.isalpha():
+                    message = "Please enter a single letter."
+                else:
+                    message = game.letter_guess(letter)
+            elif action == "word":
+                guess = (value or "").lower().strip()
+                message = game.word_guess(guess) if guess else "Please enter a valid guess."
+            elif action == "hint":
+                message = await self._hint(session, value)
+            elif action == "resign":
+                message = game.resignation(await self._ask(session, game.resignation_prompt()))
+            elif action == "timeout":
+                message = game.turn_timeout()
+            else:
+                message = f"Unknown action '{action}', expected one of: {', '.join(ACTIONS)}."
+
+            finished, outcome = await self._settle(session)
+            if finished:
+                if outcome != message:
+                    message = f"{message}\n{outcome}"
+            elif self.wheel is not None and game.game_start_time is not None:
+                game.arm_turn_timer(self.wheel, lambda notice: self._notify(session, notice))
+
+            return self._result(session, message)
+
+    def _prefetch(self, session):
+        """Ask Gemini for the start message and every kind of hint in the background, as soon as the word is chosen."""
+        game = session.game
+        prompt = game.start_prompt()
+        session.prefetched[prompt] = GeminiReply(prompt, COSMETIC)
+        if game.max_hints:  # Only in games that allow hints at all
+            for hint_type in HINT_TYPES:
+                if hint_type == LETTER_HINT or packed_hint(game.word, game.difficulty, hint_type) is not None:
+                    continue
+                prompt = game.hint_prompt(hint_type)
+                # Speculative: only sent when Gemini isn't busy with anything more pressing
+                session.prefetched[prompt] = GeminiReply(prompt, SPECULATIVE)
+
+    async def _ask(self, session, prompt):
+        """Gemini's reply to a prompt the player is waiting for (prefetched when it was asked ahead of time), passed to
+        on_stream as it arrives."""
+        reply = session.prefetched.pop(prompt, None)
+        if reply is None or reply.shed:
+            reply = GeminiReply(prompt)
+        elif not reply.task.done():
+            # Only found if the prefetch has reached the scheduler, one still looking in the cache may yet be shed
+            gemini_scheduler().promote(prompt, IN_TURN)
+        text = await self._follow(session, reply)
+        if text is None and reply.priority != IN_TURN:  # The prefetch was shed after all, ask again in-turn
+            text = await self._follow(session, GeminiReply(prompt))
+        return text
+
+    async def _follow(self, session, reply):
+        if self.on_stream is not None:
+            async for chunk in reply.follow():
+                self.on_stream(session.session_id, chunk)
+        return await reply.task
+
+    async def _start(self, session):
+        """Start the game clock and greet the player, a greeting still on its way is sent as a notice when it arrives."""
+        game = session.game
+        if game.game_start_time is not None:
+            return "The game has already started."
+
+        game.start_game_timer()
+        if self.wheel is not None:
+            game.arm_game_timer(self.wheel, lambda notice: self._notify(session, notice))
+
+        prompt = game.start_prompt()
+        task = (session.prefetched.pop(prompt, None) or GeminiReply(prompt, COSMETIC)).task
+        if task.done():
+            return task.result() or ""  # Nothing if the greeting was shed under load
+        task.add_done_callback(lambda task: task.cancelled() or task.result() is None or self._notify(session, task.result()))
+        return ""
+
+    async def _hint(self, session, hint_type):
+        game = session.game
+        reason = game.hint_unavailable()
+        if reason:
+            return reason
+
+        try:
+            hint_type = int(hint_type)
+        except (TypeError, ValueError):
+            hint_type = None
+        if hint_type not in HINT_TYPES:
+            return "Please choose a hint type: " + " | ".join(f"{key}: {name}" for key, name in HINT_TYPES.items())
+
+        # Letter hints are worked out locally and dictionary words have their hints in the hint pack, only the
+        # natural-language hints of other words go to Gemini
+        if hint_type == LETTER_HINT:
+            hint = game.letter_hint()
+            if hint is None:  # Refused before apply_hint, so it costs neither a hint nor points
+                return "Every letter is already showing, there's no letter left to hint at!"
+        else:
+            hint = packed_hint(game.word, game.difficulty, hint_type)
+        if hint is None:
+            hint = await self._ask(session, game.hint_prompt(hint_type))
+        elif self.on_stream is not None:
+            self.on_stream(session.session_id, hint)
+        return game.apply_hint(hint)
+
+    async def run(self):
+        """Drive the engine's timer wheel on this event loop (run it as a task alongside the sessions)."""
+        self.loop = asyncio.get_running_loop()
+        if self.wheel is not None:
+            await self.wheel.run_async()
@@ -0,0 +1,246 @@
+'''Cache of Gemini replies for the game's prompts. Hints, taunts and encouragements only depend on the word, the hint
+type and the difficulty, so the same prompt comes back again and again: replies are kept per normalised prompt (case and
+spacing don't matter), up to a few variants each so the game doesn't always say the same thing, and a prompt is only
+answered from the cache once it has all its variants. Entries expire after a TTL and the least recently used prompts
+are evicted from memory past a capacity. With a path, replies are also kept in a small SQLite database that every game
+process shares, so a reply fetched by one process is a hit in all the others and survives restarts. On an event loop,
+get_async/put_async look in memory inline and do the database's reads and writes on a worker thread, so a slow disk
+never holds up the other sessions'''
+
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_PATH = "gemini_cache.db"
+CAPACITY = 4096  # Prompts kept in memory
+TTL = 7 * 86400  # Seconds a reply is served for
+VARIANTS = 3  # Replies kept per prompt
+BUSY_TIMEOUT = 5  # Seconds to wait for another process's write, the cache is never worth waiting long for
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS replies (
+    prompt TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    reply TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS replies_by_prompt ON replies (prompt, stored_at);
+"""
+
+
+def normalize(prompt):
+    """The cache key of a prompt: lower case, runs of whitespace collapsed."""
+    return " ".join(prompt.lower().split())
+
+
+class ResponseCache:
+    """LRU + TTL cache of replies per normalised prompt, optionally backed by a database shared between processes."""
+
+    def __init__(self, path=None, capacity=CAPACITY, ttl=TTL, variants=VARIANTS):
+        self.path = path
+        self.capacity = capacity
+        self.ttl = ttl
+        self.variants = variants
+        self._entries = OrderedDict()  # Prompt -> [(stored_at, reply)], least recently used first
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        if path:
+            with self._connection() as connection:
+                connection.executescript(_SCHEMA)
+                connection.execute("DELETE FROM replies WHERE stored_at < ?", (time.time() - ttl,))
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")  # Losing the last replies in a power cut only costs a refetch
+            self._local.connection = connection
+        return connection
+
+    def _fresh(self, key, now):
+        """The unexpired replies held in memory for a prompt (marking it recently used), None if there are none."""
+        replies = self._entries.get(key)
+        if replies is None:
+            return None
+        live = [entry for entry in replies if now - entry[0] < self.ttl]
+        self.expired += len(replies) - len(live)
+        if not live:
+            del self._entries[key]
+            return None
+        self._entries[key] = live
+        self._entries.move_to_end(key)
+        return live
+
+    def _remember(self, key, replies):
+        self._entries[key] = replies[-self.variants:]
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _load(self, key, now):
+        """Replies other processes (or an earlier run) stored for a prompt, oldest first."""
+        try:
+            rows = self._connection().execute(
+                "SELECT stored_at, reply FROM replies WHERE prompt = ? AND stored_at >= ? ORDER BY stored_at DESC LIMIT ?",
+                (key, now - self.ttl, self.variants)
+            ).fetchall()
+        except sqlite3.Error:
+            return []
+        return rows[::-1]
+
+    def _in_memory(self, key, now):
+        with self._lock:
+            return self._fresh(key, now) or []
+
+    def _merge(self, key, replies, stored):
+        """The replies to use after reading the database, remembering the stored ones if there are more of them."""
+        if len(stored) > len(replies):
+            replies = stored
+            with self._lock:
+                self._remember(key, replies)
+        return replies
+
+    def _pick(self, replies):
+        with self._lock:
+            if len(replies) < self.variants:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return random.choice(replies)[1]
+
+    def get(self, prompt):
+        """A cached reply to the prompt, or None if it should be asked (again) to collect another variant."""
+        key = normalize(prompt)
+        now = time.time()
+        replies = self._in_memory(key, now)
+        if len(replies) < self.variants and self.path:
+            replies = self._merge(key, replies, self._load(key, now))
+        return self._pick(replies)
+
+    async def get_async(self, prompt):
+        """get() for an event loop: only a miss in memory reads the database, on a worker thread."""
+        key = normalize(prompt)
+        now = time.time()
+        replies = self._in_memory(key, now)
+        if len(replies) < self.variants and self.path:
+            replies = self._merge(key, replies, await asyncio.to_thread(self._load, key, now))
+        return self._pick(replies)
+
+    def _keep(self, key, now, reply):
+        with self._lock:
+            replies = self._fresh(key, now) or []
+            self._remember(key, replies + [(now, reply)])
+
+    def put(self, prompt, reply):
+        """Keep a reply to the prompt, the oldest variant makes way once the prompt has all of them."""
+        key = normalize(prompt)
+        now = time.time()
+        self._keep(key, now, reply)
+        if self.path:
+            self._store(key, now, reply)
+
+    async def put_async(self, prompt, reply):
+        """put() for an event loop: the reply is in memory right away, the database write happens on a worker thread."""
+        key = normalize(prompt)
+        now = time.time()
+        self._keep(key, now, reply)
+        if self.path:
+            await asyncio.to_thread(self._store, key, now, reply)
+
+    def _store(self, key, now, reply):
+        try:
+            with self._connection() as connection:
+                connection.execute("INSERT INTO replies (prompt, stored_at, reply) VALUES (?, ?, ?)", (key, now, reply))
+                connection.execute(
+                    "DELETE FROM replies WHERE prompt = ? AND rowid NOT IN "
+                    "(SELECT rowid FROM replies WHERE prompt = ? ORDER BY stored_at DESC LIMIT ?)",
+                    (key, key, self.variants)
+                )
+        except sqlite3.Error:
+            pass  # The reply is still cached in memory
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "prompts": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expired": self.expired
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.path:
+            with self._connection() as connection:
+                connection.execute("DELETE FROM replies")
+
+
+async def _benchmark(games, words, latency):
+    """Games on a fake Gemini asking for a start message and a hint, with and without the cache."""
+    import asyncio
+    import statistics
+    import tempfile
+
+    import fake_gemini
+
+    server = fake_gemini.serve(port=8767, latency=latency, background=True)
+    os.environ["GEMINI_BASE_URL"] = "http://127.0.0.1:8767"
+    import gemini_file
+
+    rng = random.Random(1)
+    vocabulary = [f"word{i}" for i in range(words)]
+    weights = [1 / (rank + 1) for rank in range(words)]  # A few words come up far more often than the rest
+    prompts = []
+    for _ in range(games):
+        word = rng.choices(vocabulary, weights)[0]
+        prompts.append("Encourage the player to try their best in this game of Hangman at easy difficulty.")
+        prompts.append(f"Provide the definition of the word '{word}'.")
+
+    async def play(cache):
+        latencies = []
+        for prompt in prompts:
+            start = time.perf_counter()
+            reply = await cache.get_async(prompt) if cache else None
+            if reply is None:
+                reply = await gemini_file.generate_text_async(prompt)
+                if cache:
+                    await cache.put_async(prompt, reply)
+            latencies.append((time.perf_counter() - start) * 1000)
+        return latencies
+
+    for label, cache in (("No cache", None), ("Cache", ResponseCache(os.path.join(tempfile.mkdtemp(), DEFAULT_PATH)))):
+        start = time.perf_counter()
+        latencies = await play(cache)
+        elapsed = time.perf_counter() - start
+        summary = f"{label:<9} {len(prompts)} prompts in {elapsed:5.2f} s | mean {statistics.mean(latencies):6.2f} ms"
+        if cache:
+            stats = cache.stats()
+            summary += f" | hit rate {stats['hit_rate']:.1%}, {stats['misses']} Gemini calls"
+        print(summary)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    # if you directly run this file it will measure the cache on a simulated stream of games:
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(description="Measure the Gemini response cache against the local fake Gemini")
+    parser.add_argument("--games", type=int, default=400)
+    parser.add_argument("--words", type=int, default=200, help="distinct secret words the games are drawn from")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds the fake Gemini takes per reply")
+    args = parser.parse_args()
+    asyncio.run(_benchmark(args.games, args.words, args.latency))
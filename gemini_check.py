@@ -0,0 +1,103 @@
+'''Resilience check for the Gemini client against the local fake Gemini server: compares a pooled client with a new
+client per call, then makes the fake API slow, failing and healthy again to show that every call, retries included, stays
+within its deadline, the circuit breaker opens and answers with canned replies, and closes again once the API recovers. Last, it
+compares the time to the first character of a long reply fetched whole and streamed'''
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import fake_gemini
+
+
+async def timed_calls(gemini, count, prompt="Give a definition of the word"):
+    """Latency of `count` sequential calls in ms, plus the replies."""
+    latencies, replies = [], []
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            replies.append(await gemini.generate_text_async(prompt))
+        except Exception as e:
+            replies.append(f"error: {type(e).__name__}")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, replies
+
+
+def report(label, latencies, replies, gemini):
+    canned = sum(reply == gemini.canned_reply("definition") for reply in replies)
+    errors = sum(reply.startswith("error") for reply in replies)
+    print(f"{label:<37} p50 {statistics.median(latencies):7.1f} ms | max {max(latencies):7.1f} ms | "
+          f"{errors} errors, {canned} canned | circuit {gemini.breaker.state}")
+
+
+async def main(port, latency):
+    server = fake_gemini.serve(port=port, latency=latency, background=True)
+    handler = server.RequestHandlerClass
+    os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{port}"
+
+    import gemini_file as gemini
+
+    gemini.TIMEOUT = 0.5
+    gemini.DEADLINE = 1.0
+    gemini.BACKOFF = 0.05
+    gemini.breaker = gemini.CircuitBreaker(threshold=3, cooldown=1.0)
+
+    # Connection setup per call, as before the client was pooled
+    latencies = []
+    for _ in range(20):
+        start = time.perf_counter()
+        await gemini._new_client().aio.models.generate_content(model=gemini.MODEL, contents="definition")
+        latencies.append((time.perf_counter() - start) * 1000)
+    print(f"{'New client per call':<37} p50 {statistics.median(latencies):7.1f} ms")
+    report("Pooled client", *await timed_calls(gemini, 20), gemini)
+
+    handler.latency = 3.0  # Far beyond the 0.5s attempt timeout, and the 1s deadline of the whole call
+    latencies, replies = await timed_calls(gemini, 6)
+    report("Slow API (3s replies, 1s deadline)", latencies, replies, gemini)
+    gemini.breaker.success()
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(gemini.generate_text, "Give a definition of the word")  # The blocking client as well
+    except Exception:
+        pass
+    latencies.append((time.perf_counter() - start) * 1000)
+    within = max(latencies) <= gemini.DEADLINE * 1000 + 100  # Some slack for the event loop and the connection
+    print(f"Slow API calls within the deadline: {'OK' if within else 'FAIL'} (max {max(latencies):.1f} ms)")
+
+    handler.latency, handler.failure_rate = latency, 1.0
+    gemini.breaker.success()
+    report("Failing API (every reply 503)", *await timed_calls(gemini, 6), gemini)
+
+    handler.failure_rate = 0.0
+    await asyncio.sleep(gemini.breaker.cooldown)
+    report("Recovered API (after the cooldown)", *await timed_calls(gemini, 6), gemini)
+
+    # A long answer, one word every 25ms (all of it within the deadline): the player sees the first of it long before the end
+    handler.chunk_delay = 0.025
+    whole, first, complete = [], [], []
+    for _ in range(5):
+        start = time.perf_counter()
+        await gemini.generate_text_async("Use the word in a sentence")
+        whole.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        async for _ in gemini.stream_text_async("Use the word in a sentence"):
+            if len(first) < len(complete) + 1:
+                first.append((time.perf_counter() - start) * 1000)
+        complete.append((time.perf_counter() - start) * 1000)
+    print(f"{'Whole reply (16 words, 25ms apart)':<37} p50 {statistics.median(whole):7.1f} ms to the first character")
+    print(f"{'Streamed reply':<37} p50 {statistics.median(first):7.1f} ms to the first character, "
+          f"{statistics.median(complete):.1f} ms to the last")
+    server.shutdown()
+    return within
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds the healthy fake API takes per reply")
+    args = parser.parse_args()
+    if not asyncio.run(main(args.port, args.latency)):
+        sys.exit(1)
@@ -0,0 +1,264 @@
+'''Central scheduler for the requests a process sends to Gemini. Identical prompts asked while one is already queued or on
+its way are coalesced into that one request (single flight), and every caller follows its reply as it streams in.
+Requests leave through a token bucket, so a crowd of sessions can't trip the API quota, and in priority order: in-turn
+requests (a hint or resignation the player is waiting for) go before cosmetic ones (start-of-game taunts and
+encouragements), which go before speculative ones (hints prefetched in case the player asks). When the queue grows past
+its bound, the lowest priority requests are shed first, oldest first, in-turn requests never are. A shed request ends
+with None, and a speculative request that is asked for in earnest is promoted to in-turn. Every caller releases the
+flight it followed, and once nobody follows a request any more (e.g. its session was closed) it is dropped from the
+queue, or cancelled if it is already on its way'''
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+
+from gemini_cache import normalize
+
+IN_TURN, COSMETIC, SPECULATIVE = 0, 1, 2
+PRIORITY_NAMES = {IN_TURN: "in-turn", COSMETIC: "cosmetic", SPECULATIVE: "speculative"}
+RATE = float(os.environ.get("GEMINI_RATE", 10))  # Requests per second sent to Gemini, on average
+BURST = 20  # Requests that may be sent at once after a quiet spell
+MAX_QUEUED = 100  # Requests waiting for a token before the lowest priority ones are shed
+
+
+class Flight:
+    """One request to Gemini, shared by every caller asking for the same prompt while it is queued or on its way."""
+
+    def __init__(self, key, prompt, priority, sequence):
+        self.key = key
+        self.prompt = prompt
+        self.priority = priority
+        self.sequence = sequence
+        self.queued = True
+        self.followers = 0  # Callers that submitted the prompt and haven't released the flight yet
+        self.sending = None  # The task asking Gemini, once dispatched
+        self.chunks = []
+        self.text = None
+        self.complete = False
+        self._changed = asyncio.Event()
+
+    def append(self, chunk):
+        self.chunks.append(chunk)
+        self._changed.set()
+
+    def finish(self, text):
+        self.text = text
+        self.complete = True
+        self._changed.set()
+
+    async def follow(self):
+        """Yield every chunk from the first, waiting for the rest until the reply is complete."""
+        sent = 0
+        while True:
+            while sent < len(self.chunks):
+                yield self.chunks[sent]
+                sent += 1
+            if self.complete:
+                return
+            self._changed.clear()
+            await self._changed.wait()
+
+    async def wait(self):
+        """The full reply, None if the request was shed."""
+        async for _ in self.follow():
+            pass
+        return self.text
+
+
+class GeminiScheduler:
+    """Coalesces, prioritises and rate limits the Gemini requests made on one event loop.
+
+    fetch(prompt, on_chunk) is the coroutine that actually asks Gemini, it passes each chunk of the reply to on_chunk and
+    returns the full text.
+    """
+
+    def __init__(self, fetch, rate=RATE, burst=BURST, max_queued=MAX_QUEUED):
+        self._fetch = fetch
+        self.rate = rate
+        self.burst = burst
+        self.max_queued = max_queued
+        self._tokens = burst
+        self._refilled = time.monotonic()
+        self._flights = {}  # Normalised prompt -> Flight, while queued or on its way
+        self._queue = []  # (priority, sequence, flight) heap, entries left behind by a promotion are skipped
+        self._queued = 0
+        self._sequence = itertools.count()
+        self._dispatcher = None
+        self._sending = set()
+        self.requests = 0
+        self.coalesced = 0
+        self.sent = 0
+        self.abandoned = 0
+        self.shed = {name: 0 for name in PRIORITY_NAMES.values()}
+
+    def submit(self, prompt, priority=IN_TURN):
+        """The flight answering the prompt: the one already queued or on its way, or a new one. The caller follows it
+        and must release() it once it is done with it."""
+        key = normalize(prompt)
+        self.requests += 1
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            flight.followers += 1
+            self._promote(flight, priority)
+            return flight
+
+        flight = self._flights[key] = Flight(key, prompt, priority, next(self._sequence))
+        flight.followers = 1
+        heapq.heappush(self._queue, (priority, flight.sequence, flight))
+        self._queued += 1
+        self._shed()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+        return flight
+
+    def release(self, flight):
+        """Stop following a flight. The last follower to leave an unfinished one drops it from the queue, or cancels the
+        request if it is already on its way, so nobody's rate limit or Gemini quota is spent on a reply nobody reads."""
+        flight.followers -= 1
+        if flight.followers > 0 or flight.complete:
+            return
+        self.abandoned += 1
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]  # The same prompt asked again from now on is a new request
+        if flight.queued:
+            flight.queued = False  # Its heap entries are skipped by _next
+            self._queued -= 1
+            flight.finish(None)
+        elif flight.sending is not None:
+            flight.sending.cancel()
+
+    def promote(self, prompt, priority=IN_TURN):
+        """Move a queued prompt up to a higher priority (e.g. a prefetched hint the player has now asked for)."""
+        flight = self._flights.get(normalize(prompt))
+        if flight is not None:
+            self._promote(flight, priority)
+
+    def _promote(self, flight, priority):
+        if flight.queued and priority < flight.priority:
+            flight.priority = priority
+            heapq.heappush(self._queue, (priority, flight.sequence, flight))
+
+    def _shed(self):
+        while self._queued > self.max_queued:
+            candidates = [flight for flight in self._flights.values() if flight.queued and flight.priority > IN_TURN]
+            if not candidates:
+                return
+            flight = max(candidates, key=lambda flight: (flight.priority, -flight.sequence))
+            flight.queued = False
+            self._queued -= 1
+            del self._flights[flight.key]
+            self.shed[PRIORITY_NAMES[flight.priority]] += 1
+            flight.finish(None)
+
+    def _next(self):
+        """The highest priority queued flight, None if the queue is empty."""
+        while self._queue:
+            priority, _, flight = heapq.heappop(self._queue)
+            if flight.queued and priority == flight.priority:
+                flight.queued = False
+                self._queued -= 1
+                return flight
+        return None
+
+    async def _token(self):
+        """Wait for the token bucket to allow one more request."""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+            self._refilled = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def _dispatch(self):
+        while self._queued:
+            await self._token()
+            flight = self._next()  # Picked after the wait, so whatever became urgent meanwhile goes first
+            if flight is None:
+                self._tokens += 1
+                break
+            task = flight.sending = asyncio.get_running_loop().create_task(self._send(flight))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, flight):
+        self.sent += 1
+        text = None
+        try:
+            text = await self._fetch(flight.prompt, flight.append)
+        finally:
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+            flight.finish(text)
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "sent": self.sent,
+            "abandoned": self.abandoned,
+            "shed": dict(self.shed),
+            "queued": self._queued,
+            "in_flight": len(self._sending)
+        }
+
+
+async def _benchmark(players, words, latency, rate):
+    """A crowd of games starting together on the fake Gemini: every game asks for its greeting and prefetches its three
+    hints, then a quarter of the players ask for the definition right away."""
+    import random
+    import statistics
+
+    import fake_gemini
+
+    server = fake_gemini.serve(port=8769, latency=latency, background=True)
+    os.environ["GEMINI_BASE_URL"] = "http://127.0.0.1:8769"
+    os.environ["GEMINI_CACHE"] = ""
+    import hangman_game
+
+    hangman_game.gemini_module().async_client()  # Imported and connected up front, not on the clock
+
+    rng = random.Random(1)
+    scheduler = GeminiScheduler(hangman_game._fetch_gemini, rate=rate)
+    hangman_game._schedulers[asyncio.get_running_loop()] = scheduler
+    words = [f"word{i}x{time.time_ns()}" for i in range(words)]
+
+    async def player(number):
+        word = rng.choice(words)
+        greeting = hangman_game.gemini_prompt("Encourage the player to try their best in this game of Hangman at easy difficulty.", priority=COSMETIC)
+        prefetches = [hangman_game.gemini_prompt(f"{kind} '{word}'.", priority=SPECULATIVE) for kind in ("Provide the definition of the word", "Provide a letter from the word", "Use the word")]
+        tasks = [asyncio.ensure_future(request) for request in [greeting, *prefetches]]
+        latency = None
+        if number % 4 == 0:
+            start = time.perf_counter()
+            await hangman_game.gemini_prompt(f"Provide the definition of the word '{word}'.", priority=IN_TURN)  # Promotes the prefetch
+            latency = (time.perf_counter() - start) * 1000
+        await asyncio.gather(*tasks)
+        return latency
+
+    start = time.perf_counter()
+    latencies = [latency for latency in await asyncio.gather(*(player(i) for i in range(players))) if latency is not None]
+    elapsed = time.perf_counter() - start
+    stats = scheduler.stats()
+    print(f"{players} players, {stats['requests']} requests: {stats['coalesced']} coalesced, {stats['sent']} sent "
+          f"({server.RequestHandlerClass.requests_served} reached the API) "
+          f"in {elapsed:.1f} s at {rate:g}/s, shed {stats['shed']}")
+    print(f"In-turn hints: p50 {statistics.median(latencies):.0f} ms, max {max(latencies):.0f} ms")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    # if you directly run this file it will send a crowd of games' requests through the scheduler:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure the Gemini request scheduler against the local fake Gemini")
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--words", type=int, default=40, help="distinct secret words the players are drawn from")
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds the fake Gemini takes per reply")
+    parser.add_argument("--rate", type=float, default=RATE, help="requests per second the scheduler lets through")
+    args = parser.parse_args()
+    asyncio.run(_benchmark(args.players, args.words, args.latency, args.rate))
@@ -0,0 +1,909 @@
+import asyncio
+import datetime
+import random
+import time
+import json
+import os
+import sqlite3
+import struct
+import threading
+import weakref
+from types import MappingProxyType
+from gemini_cache import DEFAULT_PATH as GEMINI_CACHE_PATH, ResponseCache
+from gemini_scheduler import IN_TURN, GeminiScheduler
+from hint_pack import HintPack
+from letter_hints import best_letter, word_starts
+from phrase_matcher import PhraseMatcher
+from stats_store import PlayerStatsStore, StatsWriter
+from word_pack import PackedWords, WordPack, is_word_pack, write_word_pack
+
+# Define the stick figure stages for the hangman visualization
+STICK_FIGURES = [
+    """
+______
+|    0
+| ---|---
+|   / \\ 
+|  /   \\ 
+|_____""",
+    """
+______
+|    0 
+| ---|---
+|
+|
+|_____""",
+    """
+______
+|    0
+|
+|
+|
+|_____""",
+    """
+______
+|
+|
+|
+|
+|_____""",
+    """
+|
+|
+|
+|
+|_____""",
+    """
+|
+|
+|
+|
+|______""",
+    """
+|
+|
+|
+______""",
+    """
+|
+|
+______""",
+    """
+|
+______""",
+    """
+______"""
+]
+
+# Configure difficulty settings
+DIFFICULTY_LEVELS = {
+    1: "easy", 
+    2: "medium", 
+    3: "hard", 
+    4: "challenger", 
+    5: "master", 
+    6: "creator"
+}
+
+DIFFICULTY_TIME = {
+    "easy": {"game_time_limit": 600, "turn_time_limit": 60},
+    "medium": {"game_time_limit": 540, "turn_time_limit": 45},
+    "hard": {"game_time_limit": 480, "turn_time_limit": 30},
+    "challenger": {"game_time_limit": 420, "turn_time_limit": 25},
+    "master": {"game_time_limit": 360, "turn_time_limit": 15},
+    "creator": {"game_time_limit": 900, "turn_time_limit": 120}  # Default for creator mode
+}
+
+DIFFICULTY_SCORE = {
+    "easy": {"letter_guess_score": 10, "word_guess_score": 10},
+    "medium": {"letter_guess_score": 15, "word_guess_score": 15},
+    "hard": {"letter_guess_score": 20, "word_guess_score": 30},
+    "challenger": {"letter_guess_score": 25, "word_guess_score": 45},
+    "master": {"letter_guess_score": 30, "word_guess_score": 60},
+    "creator": {"letter_guess_score": 20, "word_guess_score": 30}  # Default for creator mode
+}
+
+DIFFICULTY_SETTINGS = {
+    "easy": {"attempts": 9, "start_index": 0},       # Stages 0-8 (9 steps)
+    "medium": {"attempts": 8, "start_index": 1},     # Stages 1-8 (8 steps)
+    "hard": {"attempts": 7, "start_index": 2},       # Stages 2-8 (7 steps)
+    "challenger": {"attempts": 6, "start_index": 3}, # Stages 3-8 (6 steps)
+    "master": {"attempts": 5, "start_index": 4},     # Stages 4-8 (5 steps)
+    "creator": {"attempts": 10, "start_index": 0}    # Default for creator mode
+}
+
+HINT_TYPES = {1: "definition", 2: "letter", 3: "context in a sentence"}
+LETTER_HINT = 2  # Answered by the game itself (see letter_hints.py), the other hint types are written by Gemini
+
+def hint_prompt(word, difficulty, hint_type):
+    """Build the Gemini prompt for a hint on a word played at a difficulty (1: definition | 2: letter | 3: context in a sentence)."""
+    hint_prompts = {
+        1: f"Provide the definition of the word '{word}'. (Note: Since this is a Hangman Game, you are NOT allowed to mention the word itself only its definition of the word in simple terms).",
+        2: f"Provide a letter from the word '{word}' that hasn't been guessed yet. (Note: Since this is a Hangman Game, you are NOT allowed to mention the word itself only a specific letter).",
+        3: f"Use the word '{word}' in a sentence. (Note: Since this is a Hangman Game, you are NOT allowed to mention the word itself only contextually in a sentence of phrase in everyday life)."
+    }
+    
+    # Add difficulty-specific taunting for harder levels
+    if difficulty in ["challenger", "master"]:
+        hint_prompts[hint_type] += " Also, mock/taunt the player for needing a hint."
+    
+    return hint_prompts[hint_type]
+
+'''The Gemini integration (gemini_file and the google-genai SDK behind it) is heavy to import, so it is only loaded
+when a game needs it: warm_up_gemini() starts loading it in the background as soon as a game is being set up'''
+
+_gemini = None
+_gemini_lock = threading.Lock()
+_gemini_warm_up = None
+
+def gemini_module():
+    """The gemini_file module, imported on first use."""
+    global _gemini
+    if _gemini is None:
+        with _gemini_lock:
+            if _gemini is None:
+                import gemini_file
+                _gemini = gemini_file
+    return _gemini
+
+def warm_up_gemini():
+    """Start importing the Gemini integration on a background thread (only the first call does anything)."""
+    global _gemini_warm_up
+    with _gemini_lock:
+        if _gemini is not None or _gemini_warm_up is not None:
+            return
+        _gemini_warm_up = threading.Thread(target=_warm_up_gemini, name="gemini-warm-up", daemon=True)
+        _gemini_warm_up.start()
+
+def _warm_up_gemini():
+    try:
+        gemini_module()
+    except Exception:
+        pass  # Reported by gemini_prompt when a game actually asks Gemini something
+
+_response_cache = None
+
+def gemini_response_cache():
+    """The process-wide cache of Gemini replies, kept in gemini_cache.db (GEMINI_CACHE, empty for memory only)."""
+    global _response_cache
+    with _gemini_lock:
+        if _response_cache is None:
+            path = os.environ.get("GEMINI_CACHE", GEMINI_CACHE_PATH)
+            try:
+                _response_cache = ResponseCache(path or None)
+            except sqlite3.Error as e:
+                print(f"Error opening the Gemini cache, keeping it in memory: {e}")
+                _response_cache = ResponseCache()
+        return _response_cache
+
+async def _fetch_gemini(prompt, on_chunk):
+    """Stream Gemini's reply to a prompt (sent by the scheduler) into on_chunk, then cache and return the full text."""
+    parts = []
+    try:
+        gemini = gemini_module() if _gemini is not None else await asyncio.to_thread(gemini_module)
+        async for chunk in gemini.stream_text_async(prompt):
+            parts.append(chunk)
+            on_chunk(chunk)
+    except Exception as e:
+        print(f"Error communicating with Gemini API: {e}")
+        if parts:
+            return "".join(parts)  # Cut short, but already shown as it is
+        reply = "Unable to get response from Gemini at this time. "
+        on_chunk(reply)
+        return reply
+    reply = "".join(parts)
+    if reply and reply != gemini.canned_reply(prompt):  # Stand-ins while the circuit is open aren't worth keeping
+        await gemini_response_cache().put_async(prompt, reply)
+    return reply
+
+_schedulers = weakref.WeakKeyDictionary()
+
+def gemini_scheduler(loop=None):
+    """The request scheduler of an event loop (the running one by default), every Gemini request goes through it."""
+    loop = loop or asyncio.get_running_loop()
+    with _gemini_lock:
+        scheduler = _schedulers.get(loop)
+        if scheduler is None:
+            scheduler = _schedulers[loop] = GeminiScheduler(_fetch_gemini)
+        return scheduler
+
+# Utility function to communicate with Gemini API (awaited so a session never blocks the others)
+async def gemini_prompt(prompt, on_chunk=None, priority=IN_TURN):
+    """Send a prompt to the Gemini API and return the response (from the response cache when it has it).
+
+    With on_chunk, the reply is streamed: on_chunk is called with each piece of text as it arrives (a cached reply or
+    the error message comes as one piece), and the full text is still returned. Requests are coalesced, rate limited and
+    ordered by priority (see gemini_scheduler.py), and under load a cosmetic or speculative one may be shed: None.
+    """
+    reply = await gemini_response_cache().get_async(prompt)
+    if reply is not None:
+        if on_chunk is not None:
+            on_chunk(reply)
+        return reply
+    scheduler = gemini_scheduler()
+    flight = scheduler.submit(prompt, priority)
+    try:
+        async for chunk in flight.follow():
+            if on_chunk is not None:
+                on_chunk(chunk)
+    finally:
+        scheduler.release(flight)  # A cancelled caller (e.g. a closed session's prefetch) may leave nobody waiting
+    return flight.text
+
+'''Accessing the dictionary.json file and gathering the words dictionary accordingly: it is parsed once per process into a
+read-only structure shared by every game, and only re-read when the file's modification time or size changes'''
+
+WORD_DICTIONARY_CHECK_INTERVAL = 1.0  # Seconds between checks of the dictionary file for changes
+
+_word_dictionary_path = os.environ.get("HANGMAN_DICTIONARY") or os.path.join("python", "game", "hangman", "dictionary.json")
+_word_dictionary = None
+_word_dictionary_signature = None  # (mtime, size) of the file _word_dictionary was read from, None if it couldn't be
+_word_dictionary_checked = 0.0
+_word_dictionary_lock = threading.Lock()
+
+def _freeze(value):
+    """Read-only copy of parsed JSON: dicts become mapping proxies and lists become tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _thaw(value):
+    """Editable copy of a frozen dictionary."""
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, (tuple, PackedWords)):
+        return [_thaw(item) for item in value]
+    return value
+
+def word_dictionary_path():
+    return _word_dictionary_path
+
+def set_word_dictionary_path(path):
+    """Read the words from another dictionary file from now on (also settable with the HANGMAN_DICTIONARY variable)."""
+    global _word_dictionary_path, _word_dictionary, _word_dictionary_signature
+    with _word_dictionary_lock:
+        _word_dictionary_path = path
+        _word_dictionary = None
+        _word_dictionary_signature = None
+
+def load_word_dictionary():
+    """The dictionary of words, shared and read-only, re-read from the JSON file only when the file has changed."""
+    global _word_dictionary, _word_dictionary_signature, _word_dictionary_checked
+    now = time.monotonic()
+    words_dictionary = _word_dictionary
+    if words_dictionary is not None and now - _word_dictionary_checked < WORD_DICTIONARY_CHECK_INTERVAL:
+        return words_dictionary
+    
+    with _word_dictionary_lock:
+        try:
+            stat = os.stat(_word_dictionary_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+        _word_dictionary_checked = now
+        if _word_dictionary is None or signature != _word_dictionary_signature:
+            _word_dictionary = _read_word_dictionary(_word_dictionary_path, _word_dictionary)
+            _word_dictionary_signature = signature
+        return _word_dictionary
+
+def _read_word_dictionary(json_file_path, previous=None):
+    """Parse the dictionary file, keeping the previous words (or a basic dictionary) if it can't be read."""
+    fallback = previous if previous is not None else _freeze(create_basic_dictionary())
+    try:
+        # Compiled word packs (see word_pack.py) are memory-mapped rather than parsed
+        if is_word_pack(json_file_path):
+            print("Loading word list from word pack...\n")
+            return WordPack(json_file_path).dictionary()
+        with open(json_file_path, "r") as file:
+            print("Loading word list from JSON file...\n") 
+            return _freeze(json.load(file))
+    except FileNotFoundError:
+        print(f"Error: The file '{json_file_path}' was not found.")
+        # Create a basic dictionary if file is not found
+        return fallback
+    except (ValueError, struct.error):  # json.JSONDecodeError is a ValueError too
+        print(f"Error: The file '{json_file_path}' contains invalid JSON or is not a valid word pack.")
+        return fallback
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return fallback
+
+'''Had we not been able to gain accessed to the original dictionary file we can access it through this function'''
+
+def create_basic_dictionary():
+    """Create a basic dictionary with a few words for each difficulty level."""
+    return {
+        "easy": {
+            "words": ["apple", "banana", "orange", "grapes", "kiwi"],
+            "attempts": 9,
+            "time_limit_minutes": 10,
+            "word_length": "5-8"
+        },
+        "medium": {
+            "words": ["elephant", "giraffe", "hippopotamus", "crocodile", "zebra"],
+            "attempts": 8,
+            "time_limit_minutes": 9,
+            "word_length": "8-11"
+        },
+        "hard": {
+            "words": ["extraordinary", "magnificent", "catastrophic", "phenomenal", "inconceivable"],
+            "attempts": 7,
+            "time_limit_minutes": 8,
+            "word_length": "11-15"
+        },
+        "challenger": {
+            "phrases": ["quantum physics", "molecular biology", "artificial intelligence", "virtual reality", "machine learning"],
+            "attempts": 6,
+            "time_limit_minutes": 7,
+            "word_length": "15-20"
+        },
+        "master": {
+            "phrases": ["theory of relativity", "quantum field theory", "computational fluid dynamics", "molecular orbital theory", "statistical thermodynamics"],
+            "attempts": 5,
+            "time_limit_minutes": 6,
+            "word_length": "20-25"
+        },
+        "creator": {
+            "words": ["customword"],
+            "attempts": 10,
+            "time_limit_minutes": 15,
+            "word_length": "any"
+        }
+    }
+
+def choose_word(mode, words_dictionary=None):
+    """Pick a random word or phrase for the given difficulty."""
+    if words_dictionary is None:
+        words_dictionary = load_word_dictionary()
+    difficulty_data = words_dictionary[mode]
+    
+    # Get the word list for the difficulty
+    if "words" in difficulty_data:
+        word_list = difficulty_data["words"]
+    else:
+        word_list = difficulty_data["phrases"]
+    
+    return random.choice(word_list)
+
+'''Definition and context-sentence hints generated ahead of time for every dictionary word (see hint_pack.py) are read
+from a memory-mapped hint pack next to the dictionary, so a hint on a dictionary word never waits on the network. The
+pack is reopened when its file changes, checked at most once per WORD_DICTIONARY_CHECK_INTERVAL'''
+
+_hint_pack = None
+_hint_pack_signature = None
+_hint_pack_checked = 0.0
+_hint_pack_lock = threading.Lock()
+
+def hint_pack_path():
+    return os.environ.get("HANGMAN_HINT_PACK") or os.path.join(os.path.dirname(word_dictionary_path()), "hints.pack")
+
+def hint_pack():
+    """The current hint pack, None if there is none."""
+    global _hint_pack, _hint_pack_signature, _hint_pack_checked
+    with _hint_pack_lock:
+        now = time.monotonic()
+        if now - _hint_pack_checked < WORD_DICTIONARY_CHECK_INTERVAL:
+            return _hint_pack
+        _hint_pack_checked = now
+        path = hint_pack_path()
+        try:
+            stat = os.stat(path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+        if signature != _hint_pack_signature:
+            _hint_pack_signature = signature
+            _hint_pack = None
+            if signature is not None:
+                try:
+                    _hint_pack = HintPack(path)
+                except (OSError, ValueError, struct.error) as e:
+                    print(f"Error: Could not read the hint pack '{path}': {e}")
+        return _hint_pack
+
+def packed_hint(word, difficulty, hint_type):
+    """The hint pack's hint for a word played at a difficulty, None if it doesn't have one."""
+    pack = hint_pack()
+    return pack.get(word, difficulty, hint_type) if pack is not None else None
+
+'''If Sir Rom Zamora decides to add his own custom word into creator mode, the word will be appended accordingly through this function'''
+
+def save_custom_word(word, attempts, time_limit, turn_time_limit):
+    """Save a custom word to the creator mode in the dictionary."""
+    global _word_dictionary_checked
+    try:
+        words_dictionary = _thaw(load_word_dictionary())
+        
+        # Update creator mode settings (dictionary files without a creator tier get one)
+        creator = words_dictionary.setdefault("creator", {"word_length": "any"})
+        if "words" not in creator:
+            creator["words"] = []
+        
+        if word not in creator["words"]:
+            creator["words"].append(word)
+        
+        creator["attempts"] = attempts
+        creator["time_limit_minutes"] = time_limit // 60  # Convert seconds to minutes
+        
+        # Update global settings
+        DIFFICULTY_TIME["creator"]["game_time_limit"] = time_limit
+        DIFFICULTY_TIME["creator"]["turn_time_limit"] = turn_time_limit
+        DIFFICULTY_SETTINGS["creator"]["attempts"] = attempts
+        
+        # Save updated dictionary (written aside and renamed, so no game ever reads a half-written file)
+        json_file_path = word_dictionary_path()
+        if is_word_pack(json_file_path):
+            write_word_pack(json_file_path, words_dictionary)
+        else:
+            temporary_path = f"{json_file_path}.{os.getpid()}.tmp"
+            with open(temporary_path, "w") as file:
+                json.dump(words_dictionary, file, indent=4)
+            os.replace(temporary_path, json_file_path)
+        
+        # Every game sees the new word straight away instead of at the next check
+        _word_dictionary_checked = 0.0
+        
+        print(f"Custom word '{word}' saved successfully!")
+        return True
+    except Exception as e:
+        print(f"Error saving custom word: {e}")
+        return False
+
+'''Player statistics are kept in an indexed SQLite store (see stats_store.py), one row per player name'''
+
+_stats_store = None
+_stats_writer = None
+_stats_store_lock = threading.Lock()
+
+def player_stats_store():
+    """The process-wide player stats store, opened (and migrated from player_stats.json) on first use."""
+    global _stats_store
+    with _stats_store_lock:
+        if _stats_store is None:
+            _stats_store = PlayerStatsStore()
+        return _stats_store
+
+def player_stats_writer():
+    """The process-wide group-commit writer, games finishing at the same time are saved in one transaction."""
+    global _stats_writer
+    store = player_stats_store()
+    with _stats_store_lock:
+        if _stats_writer is None:
+            _stats_writer = StatsWriter(store)
+        return _stats_writer
+
+def load_player_stats():
+    """Load every player's statistics, best high score first."""
+    try:
+        return dict(player_stats_store().players())
+    except sqlite3.Error as e:
+        print(f"Error: Could not read player stats: {e}")
+        return {}
+
+def save_player_records(records):
+    """Apply a batch of finished games to the player stats in one transaction."""
+    player_stats_store().record_games(records)
+
+class HangmanGame:
+    def __init__(self, name, word, difficulty, remaining_attempts, game_time_limit, turn_time_limit, high_score=None):
+        self.name = name
+        self.word = word
+        self.difficulty = difficulty  # String name of difficulty
+        self.difficulty_level = next(key for key, value in DIFFICULTY_LEVELS.items() if value == difficulty)  # Number of difficulty
+        self.remaining_attempts = remaining_attempts
+        self.game_time_limit = game_time_limit
+        self.turn_time_limit = turn_time_limit
+        self.game_start_time = None
+        self.turn_start_time = None
+        self.game_timer = None  # Deadlines armed on a shared TimerWheel (see timer_wheel.py), if any
+        self.turn_timer = None
+        self.time_expired = False
+        self.guessed_letters = set()
+        self.vetoed_letters = set()
+        self.valid_letters = set()
+        self.guessed_phrases = []
+        self.phrase_matcher = PhraseMatcher()  # Every partially guessed fragment, matched against the word in one pass
+        self.compile_word()
+        self.current_score = 0
+        self.high_score = self.load_high_score() if high_score is None else high_score
+        self.outstanding_score = 0
+        self.wrong_guesses = 0
+        self.hints_used = 0
+        self.max_hints = 3 if difficulty in ["easy", "medium", "hard"] else 1
+        '''When playing in easy, medium or hard difficulty you maximum of three hints else in challenger and master you only get 1'''
+
+    def compile_word(self):
+        """Index the secret word once so guesses never rescan it."""
+        self.word_lower = self.word.lower()
+        
+        # Each letter maps to a bitmask of the positions it occupies (bit i = self.word[i])
+        self.letter_positions = {}
+        for i, letter in enumerate(self.word):
+            if letter != " ":
+                self.letter_positions[letter] = self.letter_positions.get(letter, 0) | (1 << i)
+        self.letter_counts = {letter: mask.bit_count() for letter, mask in self.letter_positions.items()}
+        
+        # word_mask covers every position that has to be revealed (spaces are always shown),
+        # revealed_mask tracks what the player has uncovered so far
+        self.word_mask = 0
+        for mask in self.letter_positions.values():
+            self.word_mask |= mask
+        self.revealed_mask = 0
+        self.word_starts = word_starts(self.word)
+        
+        # The rendered word is kept up to date by reveal() so displaying it costs nothing
+        self._display_letters = [" " if letter == " " else "_" for letter in self.word]
+        self._display_text = " ".join(self._display_letters)
+        self._outcome = None
+
+    def reveal(self, mask):
+        """Reveal the positions in mask, re-rendering the word only when something changed."""
+        newly_revealed = mask & self.word_mask & ~self.revealed_mask
+        if not newly_revealed:
+            return 0
+        
+        self.revealed_mask |= newly_revealed
+        
+        # Walk only the newly set bits (lowest first)
+        bits = newly_revealed
+        while bits:
+            lowest = bits & -bits
+            i = lowest.bit_length() - 1
+            self._display_letters[i] = self.word[i]
+            bits ^= lowest
+        
+        self._display_text = " ".join(self._display_letters)
+        return newly_revealed
+
+    def reveal_span(self, start, length):
+        """Reveal the positions word[start:start + length]."""
+        return self.reveal(((1 << length) - 1) << start)
+
+    def hidden_count(self):
+        """Number of letter positions that are still hidden."""
+        return (self.word_mask & ~self.revealed_mask).bit_count()
+
+    def load_high_score(self):
+        """Load the player's high score from saved player stats."""
+        try:
+            return player_stats_store().high_score(self.name)
+        except sqlite3.Error:
+            return 0
+
+    def start_game_timer(self):
+        """Start the timer for the entire game."""
+        self.game_start_time = time.time()
+
+    def get_elapsed_time(self):
+        """Get the elapsed time since the game started."""
+        if self.game_start_time is None:
+            return 0
+        return time.time() - self.game_start_time
+
+    def get_remaining_time(self):
+        """Get the remaining time for the game."""
+        if self.game_start_time is None:
+            return self.game_time_limit
+        elapsed = self.get_elapsed_time()
+        return max(0, self.game_time_limit - elapsed)
+
+    def start_turn_timer(self):
+        """Start the timer for the current turn."""
+        self.turn_start_time = time.time()
+
+    def turn_deadline(self):
+        """Time at which the current turn ends (never later than the end of the game)."""
+        deadline = self.turn_start_time + self.turn_time_limit
+        if self.game_start_time is not None:
+            deadline = min(deadline, self.game_start_time + self.game_time_limit)
+        return deadline
+
+    def end_turn_timer(self):
+        """End the timer for the current turn."""
+        if self.turn_start_time is None:
+            return 0
+        
+        if self.turn_timer is not None:
+            self.turn_timer.cancel()
+            self.turn_timer = None
+        
+        turn_time = time.time() - self.turn_start_time
+        self.turn_start_time = None
+        return turn_time
+
+    def turn_timeout(self):
+        """Apply the penalty for letting the turn clock run out."""
+        self.end_turn_timer()
+        
+        # Running out of game time ends the game, there's no extra turn penalty for that
+        if self.time_expired or self.get_remaining_time() <= 0:
+            return "Time's up for this turn!"
+        
+        self.remaining_attempts -= 1
+        old_score, new_score = self.score_system(0, -5)
+        return f"Time's up for this turn!\nPenalty for timeout: Score {old_score} → {new_score}"
+
+    def arm_game_timer(self, wheel, notify=print):
+        """Hand the game deadline to a shared TimerWheel, notify(message) is called if it fires."""
+        self.game_timer = wheel.schedule(self.get_remaining_time(), self._game_expired, notify)
+
+    def arm_turn_timer(self, wheel, notify=print):
+        """Start a turn that a shared TimerWheel ends at its deadline."""
+        self.start_turn_timer()
+        self.turn_timer = wheel.schedule(self.turn_deadline() - time.time(), self._turn_expired, notify)
+
+    def cancel_timers(self):
+        """Disarm every deadline this game has on a TimerWheel."""
+        for timer in (self.game_timer, self.turn_timer):
+            if timer is not None:
+                timer.cancel()
+        self.game_timer = None
+        self.turn_timer = None
+
+    def _turn_expired(self, notify):
+        """TimerWheel callback for the end of a turn."""
+        self.turn_timer = None
+        notify(self.turn_timeout())
+        
+        # The timeout penalty can cost the last attempt
+        is_finished, message = self.game_finished()
+        if is_finished:
+            notify(message)
+
+    def _game_expired(self, notify):
+        """TimerWheel callback for the end of the game."""
+        self.game_timer = None
+        self.time_expired = True
+        is_finished, message = self.game_finished()
+        if is_finished:
+            notify(message)
+
+    def score_system(self, surplus, deficit):
+        """Update scores based on game actions."""
+        # Update current score
+        old_score = self.current_score
+        self.current_score += surplus
+        self.current_score = max(0, self.current_score + deficit)  # Don't go below zero
+        
+        # Keep track of outstanding_score (accumulative positive points only)
+        if surplus > 0:
+            self.outstanding_score += surplus
+        
+        # Update high score if current score is higher
+        if self.current_score > self.high_score:
+            self.high_score = self.current_score
+        
+        return old_score, self.current_score
+
+    def word_display(self):
+        """Display the word with guessed letters revealed and underscores for hidden letters."""
+        return self._display_text
+
+    def hangman_display(self):
+        """Display the hangman figure based on wrong attempts and difficulty."""
+        settings = DIFFICULTY_SETTINGS[self.difficulty]
+        max_attempts = settings["attempts"]
+        start_index = settings["start_index"]
+        
+        # Calculate wrong attempts
+        wrong_attempts = max_attempts - self.remaining_attempts
+        
+        # Calculate which stage to show
+        if wrong_attempts <= 0:
+            return STICK_FIGURES[start_index]
+        
+        # Calculate progression through available figures
+        figures_range = len(STICK_FIGURES) - start_index - 1
+        step_size = figures_range / max_attempts if max_attempts > 0 else 0
+        
+        # Ensure the index is within bounds
+        index = min(start_index + int(wrong_attempts * step_size), len(STICK_FIGURES) - 1)
+        return STICK_FIGURES[index]
+
+    def letter_guess(self, letter):
+        """Process a letter guess."""
+        if letter in self.guessed_letters:
+            return "You've already guessed this letter."
+        
+        self.guessed_letters.add(letter)
+        
+        positions = self.letter_positions.get(letter, 0)
+        if positions:
+            self.valid_letters.add(letter)
+            self.reveal(positions)
+            # Count occurrences for better scoring
+            occurrences = self.letter_counts[letter]
+            score_gain = occurrences * DIFFICULTY_SCORE[self.difficulty]["letter_guess_score"]
+            old_score, new_score = self.score_system(score_gain, 0)
+            return f"Correct! '{letter}' is in the word {occurrences} time(s). Score: {old_score} → {new_score}"
+        else:
+            self.vetoed_letters.add(letter)
+            self.wrong_guesses += 1
+            self.remaining_attempts -= 1
+            old_score, new_score = self.score_system(
+                0, -DIFFICULTY_SCORE[self.difficulty]["letter_guess_score"]
+            )
+            return f"Wrong! '{letter}' is not in the word. Attempts left: {self.remaining_attempts}. Score: {old_score} → {new_score}"
+
+    def word_guess(self, guess):
+        """Process a word or phrase guess."""
+        if guess in self.guessed_phrases:
+            return "You've already guessed this word/phrase."
+        
+        self.guessed_phrases.append(guess)
+        
+        # Check for exact match
+        if guess.lower() == self.word_lower:
+            # Calculate bonus based on remaining hidden letters (before they get revealed)
+            hidden_letters = self.hidden_count()
+            
+            # Add all letters to guessed_letters for display
+            self.guessed_letters.update(self.letter_positions)
+            self.reveal(self.word_mask)
+            
+            score_gain = hidden_letters * DIFFICULTY_SCORE[self.difficulty]["word_guess_score"]
+            old_score, new_score = self.score_system(score_gain, 0)
+            return f"Correct! The word was '{self.word}'. Score: {old_score} → {new_score}"
+        
+        # Check for partial match: only a fragment that is in the word joins the matcher (so wrong guesses never grow or
+        # rebuild it), then one pass over the word finds every occurrence of every fragment guessed so far
+        if guess.lower() in self.word_lower:
+            self.phrase_matcher.add(guess.lower())
+            fragment_masks = self.phrase_matcher.match_masks(self.word_lower)
+            # Fill in the underscores the fragments matched in their respective places
+            for mask in fragment_masks.values():
+                self.reveal(mask)
+            
+            # Calculate bonus for partial match
+            match_length = len(guess)
+            score_gain = match_length * (DIFFICULTY_SCORE[self.difficulty]["word_guess_score"] // 2)
+            old_score, new_score = self.score_system(score_gain, 0)
+            return f"Partial match! '{guess}' is part of the word. Score: {old_score} → {new_score}"
+        
+        # Wrong guess
+        self.wrong_guesses += 1
+        self.remaining_attempts -= 1
+        old_score, new_score = self.score_system(
+            0, -DIFFICULTY_SCORE[self.difficulty]["word_guess_score"]
+        )
+        return f"Wrong! '{guess}' is not the word. Attempts left: {self.remaining_attempts}. Score: {old_score} → {new_score}"
+
+    def hint_unavailable(self):
+        """Return why a hint can't be used right now, or None if it can."""
+        # Check if hints are allowed
+        if self.hints_used >= self.max_hints:
+            return "You've used all your available hints!"
+        
+        # In harder difficulties, check attempts remaining
+        if self.difficulty == "challenger" and self.remaining_attempts > 2:
+            return "In Challenger mode, hints are only available when you have 2 or fewer attempts left."
+        elif self.difficulty == "master" and self.remaining_attempts > 1:
+            return "In Master mode, hints are only available when you have 1 attempt left."
+        
+        return None
+
+    def start_prompt(self):
+        """Build the Gemini prompt for the message that opens the game (a taunt on the harder difficulties)."""
+        if self.difficulty_level >= 4:  # For harder difficulties, add taunting
+            return "Taunt the player that regardless of if they're reading when the game is starting that it's going to start anyway."
+        return f"Encourage the player to try their best in this game of Hangman at {self.difficulty} difficulty."
+
+    def hint_prompt(self, hint_type):
+        """Build the Gemini prompt for a hint (1: definition | 2: letter | 3: context in a sentence)."""
+        return hint_prompt(self.word, self.difficulty, hint_type)
+
+    def letter_hint(self):
+        """The letter hint, worked out locally: the most informative letter that is still hidden (None if none is)."""
+        letter = best_letter(self.letter_positions, self.revealed_mask, self.word_starts)
+        if letter is None:
+            return None
+        if self.difficulty in ["challenger", "master"]:
+            return f"Needing a hint for this one? Fine, try the letter '{letter}'."
+        return f"Try the letter '{letter}'."
+
+    def apply_hint(self, hint):
+        """Charge the player for a hint."""
+        self.hints_used += 1
+        
+        # Penalize score for using hints
+        penalty = DIFFICULTY_SCORE[self.difficulty]["letter_guess_score"]
+        old_score, new_score = self.score_system(0, -penalty)
+        
+        return f"{hint}\n(Hint penalty: Score {old_score} → {new_score})"
+
+    def resignation_prompt(self):
+        """Build the Gemini prompt that sees the player off when they resign."""
+        if self.difficulty_level >= 4:  # Challenger, Master, Creator
+            return f"Taunt the player for giving up on trying to find the word '{self.word}' while simultaneously encouraging them that they could have found it (note: this is in {self.difficulty} difficulty)."
+        else:  # Easy, Medium, Hard
+            return f"Encourage the player that they could have found the word '{self.word}' had they kept trying, and to give the game another go (note: this is in {self.difficulty} difficulty)."
+
+    def resignation(self, message):
+        """Handle player resignation, message is Gemini's reply to resignation_prompt()."""
+        # Reset score
+        old_score = self.current_score
+        self.current_score = 0
+        
+        # Still save the high score before reset
+        if old_score > self.high_score:
+            self.high_score = old_score
+            
+        return self._finish(f"{message}\n\nThe word was: '{self.word}'\nYour score has been reset: {old_score} → 0")[1]
+
+    def game_finished(self):
+        """Check if the game is over and provide outcome message."""
+        # Once decided the outcome never changes (and the time bonus must only be awarded once)
+        if self._outcome is not None:
+            return self._outcome
+        
+        # Check for win condition - all letters are revealed
+        won = self.revealed_mask == self.word_mask
+        
+        if won:
+            # Add time bonus for quick completion
+            time_taken = self.get_elapsed_time()
+            time_bonus = int((self.game_time_limit - time_taken) * 0.1)  # 10% of remaining time as bonus
+            if time_bonus > 0:
+                old_score, new_score = self.score_system(time_bonus, 0)
+                bonus_message = f"Time bonus: +{time_bonus} points! Score: {old_score} → {new_score}"
+            else:
+                bonus_message = ""
+                
+            return self._finish(f"Congratulations! You won with {self.remaining_attempts} attempts left!\n" \
+                   f"Word: '{self.word}'\n" \
+                   f"Time: {time_taken:.1f} seconds\n" \
+                   f"{bonus_message}\n" \
+                   f"Final score: {self.current_score} | High score: {self.high_score}")
+        
+        # Check for loss conditions
+        if self.remaining_attempts <= 0:
+            return self._finish(f"Game over! You've run out of attempts.\n" \
+                   f"The word was: '{self.word}'\n" \
+                   f"Final score: {self.current_score} | High score: {self.high_score}")
+                   
+        if self.time_expired or self.get_remaining_time() <= 0:
+            return self._finish(f"Time's up! The game is over.\n" \
+                   f"The word was: '{self.word}'\n" \
+                   f"Final score: {self.current_score} | High score: {self.high_score}")
+        
+        # Game still in progress
+        return False, None
+
+    def _finish(self, message):
+        """Record the final outcome, the game's deadlines are no longer needed."""
+        self._outcome = True, message
+        self.cancel_timers()
+        return self._outcome
+
+    def stats_record(self):
+        """What this game contributes to the player's saved statistics, plus the game itself for the history."""
+        now = time.time()
+        return {
+            "name": self.name,
+            "high_score": self.high_score,
+            "outstanding_score": self.outstanding_score,
+            "last_played": datetime.datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S"),
+            "played_at": now,
+            "difficulty": self.difficulty,
+            "word": self.word,
+            "score": self.current_score,
+            "won": self.revealed_mask == self.word_mask,
+            "wrong_guesses": self.wrong_guesses,
+            "hints_used": self.hints_used,
+            "duration": self.get_elapsed_time()
+        }
+
+    def save_player_stats(self):
+        """Save the player's statistics to the player stats store (returns once they are committed)."""
+        try:
+            player_stats_writer().save(self.stats_record())
+            return True
+        except Exception as e:
+            print(f"Error saving player stats: {e}")
+            return False
+
+    def load_player_stats(self):
+        """Load every player's statistics from the player stats store."""
+        return load_player_stats()
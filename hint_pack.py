@@ -0,0 +1,206 @@
+'''Hint packs: the definition and context-sentence hints of every word and phrase in the dictionary (every tier, creator
+words included), generated ahead of time so a hint on a dictionary word never waits on the network mid-turn. The
+generator asks Gemini with bounded concurrency and appends each hint to a progress file as it comes in, so an
+interrupted run picks up where it stopped. The hints are then written into one file the game memory-maps and reads
+with a single hash table probe per lookup.
+
+Pack layout (little-endian): b"HHPK", version (u32), slot count (u32, a power of two), hint count (u32), then the slots
+(u64 key hash, u32 record offset, u32 record length; all zeros for an empty slot, open addressing with linear probing),
+then the records: "difficulty<TAB>word<TAB>hint type", a zero byte, and the hint in UTF-8'''
+
+import asyncio
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+MAGIC = b"HHPK"
+VERSION = 1
+PACKED_HINT_TYPES = (1, 3)  # Definition and context in a sentence, letter hints depend on the guesses so far
+HINT_NAMES = {1: "definition", 3: "context sentence"}
+CONCURRENCY = 8  # Gemini requests in flight while generating
+_HEADER = struct.Struct("<4sIII")
+_SLOT = struct.Struct("<QII")
+_LIST_KEYS = ("words", "phrases")
+
+
+def _key(word, difficulty, hint_type):
+    return f"{difficulty}\t{word}\t{hint_type}".encode("utf-8")
+
+
+def _hash(key):
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") or 1  # 0 marks an empty slot
+
+
+class HintPack:
+    """A memory-mapped hint pack. The file may be replaced (renamed over) while mapped, the mapping keeps the old one."""
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._slots, self._count = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a hint pack")
+        if version != VERSION:
+            raise ValueError(f"Unsupported hint pack version {version} in '{path}'")
+        self._records = _HEADER.size + self._slots * _SLOT.size
+
+    def __len__(self):
+        return self._count
+
+    def get(self, word, difficulty, hint_type):
+        """The packed hint for a word played at a difficulty, None if the pack doesn't have it."""
+        key = _key(word, difficulty, hint_type)
+        wanted = _hash(key)
+        mask = self._slots - 1
+        slot = wanted & mask
+        while True:
+            stored, offset, length = _SLOT.unpack_from(self._map, _HEADER.size + slot * _SLOT.size)
+            if stored == 0:
+                return None
+            if stored == wanted:
+                start = self._records + offset
+                record_key, _, hint = self._map[start:start + length].partition(b"\0")
+                if record_key == key:
+                    return hint.decode("utf-8")
+            slot = (slot + 1) & mask
+
+
+def write_hint_pack(path, hints):
+    """Write {(word, difficulty, hint_type): hint} as a hint pack, through a temporary file renamed into place."""
+    slots = 1
+    while slots < len(hints) * 2:  # At most half full, so a probe rarely goes past its first slot
+        slots *= 2
+    table = bytearray(slots * _SLOT.size)
+    records = bytearray()
+    mask = slots - 1
+    for (word, difficulty, hint_type), hint in hints.items():
+        key = _key(word, difficulty, hint_type)
+        record = key + b"\0" + hint.encode("utf-8")
+        slot = _hash(key) & mask
+        while _SLOT.unpack_from(table, slot * _SLOT.size)[0]:
+            slot = (slot + 1) & mask
+        _SLOT.pack_into(table, slot * _SLOT.size, _hash(key), len(records), len(record))
+        records += record
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, slots, len(hints)))
+        file.write(table)
+        file.write(records)
+    os.replace(temporary_path, path)
+
+
+def dictionary_entries(dictionary):
+    """Every (word, difficulty) of a dictionary, each tier's words played at its own difficulty."""
+    for difficulty, tier in dictionary.items():
+        list_key = next((key for key in _LIST_KEYS if key in tier), None)
+        for word in tier[list_key] if list_key else ():
+            yield word, difficulty
+
+
+def _read_progress(path):
+    """The hints a previous run already generated, a line cut short by a crash is ignored."""
+    hints = {}
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    word, difficulty, hint_type, hint = json.loads(line)
+                except ValueError:
+                    continue
+                hints[(word, difficulty, hint_type)] = hint
+    except FileNotFoundError:
+        pass
+    return hints
+
+
+async def generate(dictionary, output, progress_path=None, concurrency=CONCURRENCY):
+    """Generate the packed hints of every dictionary word missing from the progress file, then write the pack.
+
+    Returns (hints generated by this run, hints that failed, hints in the pack). Failed hints are left out of the pack,
+    running again retries just those.
+    """
+    from hangman_game import gemini_module, hint_prompt
+
+    gemini = gemini_module()
+    progress_path = progress_path or f"{output}.progress"
+    hints = _read_progress(progress_path)
+    wanted = list(dict.fromkeys(  # A word listed twice in a tier is one hint
+        (word, difficulty, hint_type) for word, difficulty in dictionary_entries(dictionary) for hint_type in PACKED_HINT_TYPES
+    ))
+    jobs = asyncio.Queue()
+    for job in wanted:
+        if job not in hints:
+            jobs.put_nowait(job)
+    total = jobs.qsize()
+    generated = failed = 0
+
+    with open(progress_path, "a", encoding="utf-8") as progress:
+        async def worker():
+            nonlocal generated, failed
+            while not jobs.empty():
+                word, difficulty, hint_type = job = jobs.get_nowait()
+                prompt = hint_prompt(word, difficulty, hint_type)
+                try:
+                    hint = await gemini.generate_text_async(prompt)
+                except Exception as e:
+                    print(f"Error generating {HINT_NAMES[hint_type]} hint for '{word}': {e}")
+                    hint = None
+                if not hint or hint == gemini.canned_reply(prompt):
+                    failed += 1
+                    continue
+                hints[job] = hint
+                progress.write(json.dumps([word, difficulty, hint_type, hint]) + "\n")
+                progress.flush()  # Kept even if the run is killed right after
+                generated += 1
+                if (generated + failed) % 100 == 0:
+                    print(f"{generated + failed}/{total} hints ({failed} failed)")
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    write_hint_pack(output, {job: hints[job] for job in wanted if job in hints})
+    return generated, failed, sum(job in hints for job in wanted)
+
+
+def _load_dictionary(path):
+    from word_pack import WordPack, is_word_pack
+
+    if is_word_pack(path):
+        return WordPack(path).dictionary()
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+if __name__ == "__main__":
+    # if you directly run this file it will generate the hint pack of a dictionary:
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Generate the definition and context-sentence hints of every dictionary word")
+    parser.add_argument("source", nargs="?", default="dictionary.json", help="dictionary.json or a word pack")
+    parser.add_argument("-o", "--output", help="where to write the pack (default: where the game looks for it, see hangman_game.hint_pack_path)")
+    parser.add_argument("--progress", help="progress file to resume from (default: OUTPUT.progress)")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--fake-gemini", type=float, metavar="LATENCY",
+                        help="generate against a local fake Gemini that takes LATENCY seconds per reply")
+    args = parser.parse_args()
+
+    if args.fake_gemini is not None:
+        import fake_gemini
+
+        fake_gemini.serve(port=8779, latency=args.fake_gemini, background=True)
+        os.environ["GEMINI_BASE_URL"] = "http://127.0.0.1:8779"
+
+    if args.output is None:
+        from hangman_game import hint_pack_path
+
+        args.output = hint_pack_path()
+
+    start = time.perf_counter()
+    generated, failed, packed = asyncio.run(generate(_load_dictionary(args.source), args.output, args.progress, args.concurrency))
+    print(f"Generated {generated} hints ({failed} failed) in {time.perf_counter() - start:.1f} s, "
+          f"{packed} hints in {args.output} ({os.path.getsize(args.output) / 1e3:.1f} kB)")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,104 @@
+'''Local letter hints: the game already knows the secret word and what is showing, so the "letter" hint is computed here
+instead of asking Gemini (which could name a letter that was already guessed or isn't in the word at all). Every letter
+that still has hidden positions is scored from the word's letter bitmasks: each hidden position it would reveal counts,
+a position that starts a word counts double (the first letters anchor a word or phrase), and ties go to the rarer
+letter in English, the one the player is least likely to try next'''
+
+# Relative frequency of each letter in English text (percent)
+ENGLISH_FREQUENCY = {
+    "e": 12.7, "t": 9.1, "a": 8.2, "o": 7.5, "i": 7.0, "n": 6.7, "s": 6.3, "h": 6.1, "r": 6.0, "d": 4.3, "l": 4.0,
+    "c": 2.8, "u": 2.8, "m": 2.4, "w": 2.4, "f": 2.2, "g": 2.0, "y": 2.0, "p": 1.9, "b": 1.5, "v": 1.0, "k": 0.8,
+    "j": 0.15, "x": 0.15, "q": 0.1, "z": 0.07
+}
+
+
+def word_starts(word):
+    """Bitmask of the positions that start a word of the phrase."""
+    mask = 0
+    for i, letter in enumerate(word):
+        if letter != " " and (i == 0 or word[i - 1] == " "):
+            mask |= 1 << i
+    return mask
+
+
+def best_letter(letter_positions, revealed_mask, starts_mask):
+    """The most informative letter that still has hidden positions, None if everything is showing.
+
+    letter_positions maps each letter to the bitmask of its positions in the word, revealed_mask and starts_mask are
+    the positions already showing and the positions that start a word.
+    """
+    best, best_score = None, None
+    for letter, positions in letter_positions.items():
+        hidden = positions & ~revealed_mask
+        if not hidden:
+            continue
+        score = (hidden.bit_count() + (hidden & starts_mask).bit_count(), -ENGLISH_FREQUENCY.get(letter, 0.0), letter)
+        if best_score is None or score > best_score:
+            best, best_score = letter, score
+    return best
+
+
+def _check_nothing_hidden():
+    """A letter hint with every letter showing is refused, and costs neither a hint nor points."""
+    import asyncio
+
+    from game_engine import GameEngine
+    from hangman_game import LETTER_HINT
+
+    async def ask():
+        engine = GameEngine()
+        session_id, _ = await engine.create_session("check", "easy", "hello world")
+        session = engine.sessions.get(session_id)
+        game = session.game
+        game.current_score = 30
+        game.reveal(game.word_mask)
+        message = await engine._hint(session, LETTER_HINT)  # Straight to the hint, submit() would end the game first
+        engine.close_session(session_id)
+        return message, game.hints_used, game.current_score
+
+    message, hints_used, score = asyncio.run(ask())
+    ok = hints_used == 0 and score == 30
+    print(f"Letter hint with nothing hidden: {'OK' if ok else 'FAIL'} ({message})")
+    return ok
+
+
+if __name__ == "__main__":
+    # if you directly run this file it will check and time letter hints over the dictionary and compare them with a random letter:
+    import json
+    import random
+    import sys
+    import time
+
+    from hangman_game import HangmanGame
+
+    if not _check_nothing_hidden():
+        sys.exit(1)
+
+    with open(sys.argv[1] if len(sys.argv) > 1 else "dictionary.json", "r", encoding="utf-8") as file:
+        dictionary = json.load(file)
+
+    rng = random.Random(1)
+    games = []
+    for difficulty, tier in dictionary.items():
+        for word in tier.get("words", tier.get("phrases", [])):
+            game = HangmanGame("bench", word, difficulty, 9, 600, 60, high_score=0)
+            for letter in rng.sample("etaoinshrdlu", 3):  # A few common letters already guessed
+                game.letter_guess(letter)
+            if game.hidden_count():
+                games.append(game)
+
+    runs = 100
+    start = time.perf_counter()
+    for _ in range(runs):
+        for game in games:
+            best_letter(game.letter_positions, game.revealed_mask, game.word_starts)
+    per_hint = (time.perf_counter() - start) / (runs * len(games)) * 1e6
+
+    chosen = random_pick = 0
+    for game in games:
+        hidden = {letter: (mask & ~game.revealed_mask).bit_count() for letter, mask in game.letter_positions.items()}
+        hidden = {letter: count for letter, count in hidden.items() if count}
+        chosen += hidden[best_letter(game.letter_positions, game.revealed_mask, game.word_starts)]
+        random_pick += sum(hidden.values()) / len(hidden)
+    print(f"{len(games)} words: {per_hint:.1f} µs per letter hint, reveals {chosen / len(games):.2f} hidden positions "
+          f"on average (any unrevealed letter: {random_pick / len(games):.2f})")
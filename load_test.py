@@ -0,0 +1,109 @@
+'''Load script for the web server: starts the fake Gemini API and the server (unless --url is given), then has many
+concurrent players create games and play them through the JSON endpoints, reporting requests per second and latency'''
+
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import string
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+import fake_gemini
+
+
+def player(url, deadline, latencies, errors):
+    """One player on a keep-alive connection: start a game, guess letters, peek at the state, repeat."""
+    parsed = urllib.parse.urlparse(url)
+    connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=30)
+    headers = {"Content-Type": "application/json"}
+
+    def call(method, path, body=None):
+        start = time.perf_counter()
+        connection.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+        response = connection.getresponse()
+        data = response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status >= 400:
+            errors.append(response.status)
+            return None
+        return json.loads(data) if data else None
+
+    while time.time() < deadline:
+        created = call("POST", "/sessions", {"name": f"load-{threading.get_ident()}", "difficulty": random.choice(["easy", "medium", "hard"])})
+        if created is None:
+            continue
+        session_id = created["session_id"]
+        for letter in random.sample(string.ascii_lowercase, 26):
+            if time.time() >= deadline:
+                break
+            result = call("POST", f"/sessions/{session_id}/actions", {"action": "letter", "value": letter})
+            call("GET", f"/sessions/{session_id}")
+            if result is None or result["state"]["finished"]:
+                break
+        call("DELETE", f"/sessions/{session_id}")
+    connection.close()
+
+
+def run(url, users, duration):
+    latencies, errors = [], []
+    deadline = time.time() + duration
+    threads = [threading.Thread(target=player, args=(url, deadline, latencies, errors)) for _ in range(users)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{len(latencies)} requests in {elapsed:.1f}s with {users} concurrent players: {len(latencies) / elapsed:.0f} requests/s")
+    if latencies:
+        print(f"Latency p50 {statistics.median(latencies) * 1000:.1f}ms | p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms")
+    print(f"Errors: {len(errors)}")
+
+
+def wait_for(url, timeout=30):
+    parsed = urllib.parse.urlparse(url)
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=1)
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not come up")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the Hangman web server against a local fake Gemini")
+    parser.add_argument("--url", help="an already running server (otherwise one is started)")
+    parser.add_argument("--users", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--gemini-latency", type=float, default=0.05, help="seconds the fake Gemini takes per reply")
+    parser.add_argument("--server", default=f"{sys.executable} web_server.py --port 5055",
+                        help="command used to start the server, e.g. gunicorn -w 4 -b 127.0.0.1:5055 \"web_server:create_app()\"")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        fake_gemini.serve(port=8765, latency=args.gemini_latency, background=True)
+        env = dict(os.environ, GEMINI_BASE_URL="http://127.0.0.1:8765")
+        server = subprocess.Popen(args.server, shell=True, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        url = "http://127.0.0.1:5055"
+
+    try:
+        wait_for(url)
+        run(url, args.users, args.duration)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
@@ -0,0 +1,111 @@
+'''Phrase matching engine behind fractional word guessing: every guessed fragment is compiled into one Aho-Corasick automaton
+so a single pass over the secret word finds every occurrence of every fragment'''
+
+from collections import deque
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over guessed fragments that reports every matched span."""
+
+    def __init__(self, fragments=(), whole_words=False):
+        self.whole_words = whole_words  # Only accept matches that start and end on a word boundary
+        self.fragments = set()
+        self._goto = [{}]    # state -> {character: next state}
+        self._fail = [0]     # state -> longest proper suffix state
+        self._terminal = [0]  # state -> length of the fragment spelled out by this state (0 if none)
+        self._output = [()]   # state -> lengths of every fragment that ends in this state
+        self._built = True
+        for fragment in fragments:
+            self.add(fragment)
+
+    def add(self, fragment):
+        """Add a fragment to the automaton, returns False if it was empty or already known."""
+        if not fragment or fragment in self.fragments:
+            return False
+
+        self.fragments.add(fragment)
+
+        state = 0
+        for character in fragment:
+            next_state = self._goto[state].get(character)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][character] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminal.append(0)
+                self._output.append(())
+            state = next_state
+
+        self._terminal[state] = len(fragment)
+        self._built = False
+        return True
+
+    def _build(self):
+        """Compute failure links breadth first and fold each state's suffix outputs into it."""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            self._output[state] = (self._terminal[state],) if self._terminal[state] else ()
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail = self._fail[state]
+                while fail and character not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(character, 0)
+
+                self._fail[next_state] = fail
+                # The failure state is shallower so its outputs are already final
+                own = (self._terminal[next_state],) if self._terminal[next_state] else ()
+                self._output[next_state] = own + self._output[fail]
+
+        self._built = True
+
+    def _on_boundary(self, text, start, end):
+        return (start == 0 or text[start - 1] == " ") and (end == len(text) or text[end] == " ")
+
+    def find_spans(self, text):
+        """Yield (start, end) for every occurrence of every fragment in text, in one pass."""
+        if not self._built:
+            self._build()
+
+        state = 0
+        for i, character in enumerate(text):
+            while state and character not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(character, 0)
+
+            end = i + 1
+            for length in self._output[state]:
+                start = end - length
+                if not self.whole_words or self._on_boundary(text, start, end):
+                    yield start, end
+
+    def match_masks(self, text):
+        """Map each fragment found in text to the bitmask (bit i = text[i]) of every position it covers."""
+        masks = {}
+        for start, end in self.find_spans(text):
+            fragment = text[start:end]
+            masks[fragment] = masks.get(fragment, 0) | ((1 << (end - start)) - 1) << start
+        return masks
+
+    def match_mask(self, text):
+        """Bitmask of every position in text covered by any matched fragment."""
+        mask = 0
+        for fragment_mask in self.match_masks(text).values():
+            mask |= fragment_mask
+        return mask
+
+
+if __name__ == "__main__":
+    # if you directly run this file it will demonstrate the matcher on a master phrase:
+    phrase = "thermodynamic equilibrium states"
+    matcher = PhraseMatcher(["dyna", "equilibrium", "at"])
+    print(phrase)
+    print("".join(c if matcher.match_mask(phrase) >> i & 1 else "_" for i, c in enumerate(phrase)))
+    print(list(matcher.find_spans(phrase)))
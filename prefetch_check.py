@@ -0,0 +1,87 @@
+'''Hint latency check for the game engine against the local fake Gemini server: plays games that start, think for a
+moment and ask for a hint, once with the engine prefetching the start message and hints as soon as the word is chosen
+and once asking Gemini only when the player does, and reports how long the start and the hint kept the player waiting.
+It also checks that a hint whose prefetch is shed after the player asked for it is still answered'''
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import fake_gemini
+
+
+async def play(engine, games, think):
+    """Per game: ms until the game clock ran after "start", ms until the hint came back."""
+    starts, hints = [], []
+    for game in range(games):
+        # A word of its own per game, so the response cache never has the answers already
+        session_id, _ = await engine.create_session(f"prefetch-{game}", "easy", f"word{game}x{time.time_ns()}")
+        start = time.perf_counter()
+        await engine.submit(session_id, "start")
+        starts.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.sleep(think)  # The player looks at the board and guesses a letter first
+        await engine.submit(session_id, "letter", "e")
+        start = time.perf_counter()
+        await engine.submit(session_id, "hint", 1)
+        hints.append((time.perf_counter() - start) * 1000)
+        engine.close_session(session_id)
+    return starts, hints
+
+
+async def shed_after_ask():
+    """Ask for a hint while its prefetch is still looking in the (on-disk) cache, then shed it once it reaches the
+    scheduler: the player must still get the hint, not "None". Returns the hint message."""
+    import hangman_game
+    from game_engine import GameEngine
+    from gemini_cache import ResponseCache
+    from gemini_scheduler import MAX_QUEUED
+
+    hangman_game._response_cache = ResponseCache(os.path.join(tempfile.mkdtemp(), "gemini_cache.db"))
+    hangman_game.gemini_scheduler().max_queued = 0  # Every cosmetic or speculative request is shed as it is queued
+    try:
+        engine = GameEngine()
+        session_id, _ = await engine.create_session("shed", "easy", f"word{time.time_ns()}")
+        await engine.submit(session_id, "start")
+        result = await engine.submit(session_id, "hint", 1)
+        engine.close_session(session_id)
+        return result["message"]
+    finally:
+        hangman_game.gemini_scheduler().max_queued = MAX_QUEUED
+        hangman_game._response_cache = None
+
+
+async def main(port, latency, games, think):
+    fake_gemini.serve(port=port, latency=latency, background=True)
+    os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["GEMINI_CACHE"] = ""
+
+    from game_engine import GameEngine
+
+    message = await shed_after_ask()
+    failed = message.startswith("None")
+    print(f"Hint shed after it was asked for: {'FAIL' if failed else 'OK'} ({message.splitlines()[0][:60]})")
+    if failed:
+        sys.exit(1)
+
+    for label, prefetch in (("Asked when needed", False), ("Prefetched", True)):
+        engine = GameEngine()
+        if not prefetch:
+            engine._prefetch = lambda session: None
+        starts, hints = await play(engine, games, think)
+        print(f"{label:<18} start p50 {statistics.median(starts):7.1f} ms | hint p50 {statistics.median(hints):7.1f} ms, "
+              f"max {max(hints):7.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8768)
+    parser.add_argument("--latency", type=float, default=0.8, help="seconds the fake Gemini takes per reply")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--think", type=float, default=2.0, help="seconds the player spends before asking for a hint")
+    args = parser.parse_args()
+    asyncio.run(main(args.port, args.latency, args.games, args.think))
@@ -0,0 +1,253 @@
+'''Multi-process game server: sessions are sharded by a hash of the player's name across worker processes (each running
+its own GameEngine and event loop, so rendering, scoring and phrase matching can run on several cores), a front
+dispatcher routes every action to the worker that owns the session and a single writer process applies all player stats
+updates. Throughput is expected to grow with the number of cores, but only the single-shard figure has been measured'''
+
+import asyncio
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import zlib
+
+from game_engine import GameEngine
+from gemini_scheduler import RATE
+from hangman_game import gemini_scheduler, player_stats_store, save_player_records
+from timer_wheel import TimerWheel
+
+# Exceptions that cross the process boundary as themselves, anything else becomes a RuntimeError
+_FORWARDED_ERRORS = {"KeyError": KeyError, "ValueError": ValueError}
+
+
+def shard_for(name, shards):
+    """Stable shard index for a player name (the same in every process, unlike hash())."""
+    name = name.strip() or "Hangman Player"
+    return zlib.crc32(name.encode()) % shards
+
+
+def _stats_writer_main(records):
+    """The single stats writer: applies every queued record in one batch, so a burst of finished games costs one transaction."""
+    while True:
+        batch = [records.get()]
+        while batch[-1] is not None:
+            try:
+                batch.append(records.get_nowait())
+            except queue.Empty:
+                break
+
+        stop = batch[-1] is None
+        batch = [record for record in batch if record is not None]
+        if batch:
+            try:
+                save_player_records(batch)
+            except Exception as e:
+                print(f"Error saving player stats: {e}")
+        if stop:
+            return
+
+
+def _worker_main(connection, shard, records, server_timers, max_sessions, idle_timeout, gemini_rate):
+    asyncio.run(_serve_shard(connection, shard, records, server_timers, max_sessions, idle_timeout, gemini_rate))
+
+
+async def _serve_shard(connection, shard, records, server_timers, max_sessions, idle_timeout, gemini_rate):
+    """Run one shard's GameEngine, answering (request_id, method, args) messages from the dispatcher."""
+    loop = asyncio.get_running_loop()
+    gemini_scheduler().rate = gemini_rate
+    engine = GameEngine(
+        wheel=TimerWheel() if server_timers else None,
+        max_sessions=max_sessions,
+        idle_timeout=idle_timeout,
+        high_score_lookup=player_stats_store().high_score,
+        stats_writer=records.put,
+        session_prefix=f"{shard}-"
+    )
+    engine_task = loop.create_task(engine.run())
+
+    # Pipe reads block, so a reader thread hands the requests over to the event loop
+    requests = asyncio.Queue()
+
+    def read():
+        while True:
+            try:
+                message = connection.recv()
+            except (EOFError, OSError):
+                message = None
+            loop.call_soon_threadsafe(requests.put_nowait, message)
+            if message is None:
+                return
+
+    threading.Thread(target=read, daemon=True).start()
+
+    async def handle(request_id, method, args):
+        try:
+            if method == "close_session":
+                result = engine.close_session(*args)
+            elif method == "status":
+                result = engine.status()
+            else:
+                result = await getattr(engine, method)(*args)
+            reply = (request_id, True, result)
+        except Exception as e:
+            reply = (request_id, False, (type(e).__name__, e.args[0] if e.args else str(e)))
+        connection.send(reply)  # Only ever called from the event loop thread
+
+    tasks = set()
+    while True:
+        message = await requests.get()
+        if message is None:
+            break
+        task = loop.create_task(handle(*message))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    engine_task.cancel()
+
+
+def _resolve(future, ok, payload):
+    if future.cancelled():
+        return
+    if ok:
+        future.set_result(payload)
+    else:
+        error_type, message = payload
+        future.set_exception(_FORWARDED_ERRORS.get(error_type, RuntimeError)(message))
+
+
+class ShardedEngine:
+    """Same async API as GameEngine, every call is forwarded to the worker process that owns the session."""
+
+    def __init__(self, shards=None, server_timers=True, max_sessions=None, idle_timeout=None):
+        self.shards = shards or os.cpu_count() or 1
+        context = multiprocessing.get_context("spawn")  # Never fork a process that already runs threads
+        self._records = context.Queue()
+        self._writer = context.Process(target=_stats_writer_main, args=(self._records,), name="stats-writer", daemon=True)
+        self._writer.start()
+
+        # Each shard's sessions are capped at an even share of the total, and so are its Gemini requests per second
+        per_shard = -(-max_sessions // self.shards) if max_sessions else None
+        gemini_rate = RATE / self.shards
+
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._connections = []
+        self._send_locks = []
+        self._workers = []
+        for shard in range(self.shards):
+            front, back = context.Pipe()
+            worker = context.Process(
+                target=_worker_main, args=(back, shard, self._records, server_timers, per_shard, idle_timeout, gemini_rate),
+                name=f"game-shard-{shard}", daemon=True
+            )
+            worker.start()
+            back.close()
+            self._connections.append(front)
+            self._send_locks.append(threading.Lock())
+            self._workers.append(worker)
+            threading.Thread(target=self._read, args=(shard,), daemon=True).start()
+
+    def _read(self, shard):
+        """Resolve the dispatcher's futures as a worker's replies come back."""
+        connection = self._connections[shard]
+        while True:
+            try:
+                request_id, ok, payload = connection.recv()
+            except (EOFError, OSError):
+                return
+            future = self._pending.pop(request_id, None)
+            if future is not None:
+                future.get_loop().call_soon_threadsafe(_resolve, future, ok, payload)
+
+    def _send(self, shard, message):
+        with self._send_locks[shard]:
+            self._connections[shard].send(message)
+
+    async def _call(self, shard, method, *args):
+        future = asyncio.get_running_loop().create_future()
+        request_id = next(self._ids)
+        self._pending[request_id] = future
+        self._send(shard, (request_id, method, args))
+        return await future
+
+    def _shard_of(self, session_id):
+        shard, _, _ = str(session_id).partition("-")
+        if not shard.isdigit() or int(shard) >= self.shards:
+            raise KeyError(f"Unknown game session '{session_id}'")
+        return int(shard)
+
+    async def create_session(self, name, difficulty, word=None):
+        return await self._call(shard_for(name, self.shards), "create_session", name, difficulty, word)
+
+    async def submit(self, session_id, action, value=None):
+        return await self._call(self._shard_of(session_id), "submit", session_id, action, value)
+
+    async def get_state(self, session_id):
+        return await self._call(self._shard_of(session_id), "get_state", session_id)
+
+    def close_session(self, session_id):
+        try:
+            shard = self._shard_of(session_id)
+        except KeyError:
+            return
+        self._send(shard, (0, "close_session", (session_id,)))  # Nobody waits for request 0's reply
+
+    def status(self):
+        return {"shards": self.shards, "workers_alive": sum(worker.is_alive() for worker in self._workers)}
+
+    async def run(self):
+        """Deadlines are driven inside each shard, nothing to run on the dispatcher's loop."""
+
+    def shutdown(self):
+        """Stop the workers, then let the writer flush the last stats records."""
+        for shard in range(self.shards):
+            try:
+                self._send(shard, None)
+            except OSError:
+                pass
+        for worker in self._workers:
+            worker.join(5)
+        self._records.put(None)
+        self._writer.join(10)
+
+
+async def _benchmark(shards, players, rounds):
+    """Players on master phrases guess letters and fragments as fast as the shards answer, returns actions per second."""
+    import string
+    import time
+
+    engine = ShardedEngine(shards, server_timers=False)
+    try:
+        phrase = "neuropharmacological effects research"
+        session_ids = [
+            (await engine.create_session(f"bench-{i}", "master", phrase))[0] for i in range(players)
+        ]
+
+        async def play(session_id):
+            for i in range(rounds):
+                if i % 3 == 2:
+                    await engine.submit(session_id, "word", phrase[i % 20:i % 20 + 5])
+                else:
+                    await engine.submit(session_id, "letter", string.ascii_lowercase[i % 26])
+                await engine.get_state(session_id)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(play(session_id) for session_id in session_ids))
+        return players * rounds * 2 / (time.perf_counter() - start)
+    finally:
+        engine.shutdown()
+
+
+if __name__ == "__main__":
+    # if you directly run this file it will benchmark throughput on one shard and on one shard per core:
+    import tempfile
+
+    os.chdir(tempfile.mkdtemp())  # Keep the benchmark's player stats away from the real ones
+    cores = os.cpu_count() or 1
+    single = asyncio.run(_benchmark(1, 200, 60))
+    print(f"1 shard: {single:.0f} actions/s")
+    if cores > 1:
+        sharded = asyncio.run(_benchmark(cores, 200, 60))
+        print(f"{cores} shards: {sharded:.0f} actions/s ({sharded / single:.2f}x)")
+    else:
+        print("Only one core available, nothing to scale across")
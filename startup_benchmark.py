@@ -0,0 +1,70 @@
+'''Startup benchmark for the terminal game: launches "The Hangman Game.py" in fresh interpreters with -X importtime and
+measures the time from process start to the main menu, the slowest imports on the way, and whether the Gemini SDK was
+imported before the menu (it shouldn't be, it is only loaded once a game is set up)'''
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+TIME_TO_MENU_TARGET_MS = 150
+MENU = "===== HANGMAN GAME ====="
+GAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "The Hangman Game.py")
+
+
+def launch(environment, directory):
+    """Start the game, wait for the menu, choose Exit. Returns (seconds to the menu, -X importtime report)."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-X", "importtime", GAME], cwd=directory, env=environment,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    for line in process.stdout:
+        if MENU in line:
+            elapsed = time.perf_counter() - start
+            break
+    else:
+        raise RuntimeError(f"The game exited before showing its menu:\n{process.stderr.read()}")
+    _, report = process.communicate("5\n", timeout=30)
+    return elapsed, report
+
+
+def slowest_imports(report, count):
+    """The top-level imports with the highest cumulative time, as (microseconds, module)."""
+    imports = []
+    for match in re.finditer(r"^import time:\s+\d+ \|\s+(\d+) \| (\S.*)$", report, re.MULTILINE):
+        imports.append((int(match.group(1)), match.group(2)))
+    return sorted(imports, reverse=True)[:count]
+
+
+def run(runs):
+    directory = tempfile.mkdtemp()  # The game's player stats end up here, not next to the real ones
+    # Bytecode is cached (outside the source tree) and the first run, which compiles it, is not counted
+    environment = dict(os.environ, PYTHONPYCACHEPREFIX=tempfile.mkdtemp())
+    environment.pop("PYTHONDONTWRITEBYTECODE", None)
+    launch(environment, directory)
+
+    times, report = [], ""
+    for _ in range(runs):
+        elapsed, report = launch(environment, directory)
+        times.append(elapsed * 1000)
+
+    median = statistics.median(times)
+    print(f"Time to menu: median {median:.0f} ms, best {min(times):.0f} ms over {runs} runs (target {TIME_TO_MENU_TARGET_MS} ms)")
+    print("Slowest imports:")
+    for microseconds, module in slowest_imports(report, 5):
+        print(f"  {microseconds / 1000:7.1f} ms  {module}")
+    gemini_loaded = re.search(r"\| \s*(google\.genai|gemini_file)$", report, re.MULTILINE) is not None
+    print(f"Gemini SDK imported before the menu: {'yes' if gemini_loaded else 'no'}")
+    return 0 if median <= TIME_TO_MENU_TARGET_MS and not gemini_loaded else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    sys.exit(run(args.runs))
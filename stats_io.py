@@ -0,0 +1,189 @@
+'''Streaming import and export of player statistics for backups, migrations and merging the stats of several hosts.
+Files are read and written one player at a time, so memory stays flat however many players a file holds. Two formats:
+JSON Lines (one {"name": ..., "high_score": ...} object per line, read and written) and the legacy player_stats.json
+(one object mapping every name to its stats, read only)'''
+
+import json
+
+from stats_store import FIELDS
+
+CHUNK_SIZE = 1 << 16  # Characters read from a legacy file at a time
+
+
+def read_jsonl(file):
+    """(name, stats) for every player in a JSON Lines file."""
+    for line_number, line in enumerate(file, 1):
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if not isinstance(record, dict) or not isinstance(record.get("name"), str):
+            raise ValueError(f"Line {line_number}: expected an object with a player name")
+        yield record["name"], {field: record[field] for field in FIELDS if field in record}
+
+
+def read_legacy_json(file, chunk_size=CHUNK_SIZE):
+    """(name, stats) for every player in a legacy player_stats.json, parsed incrementally instead of with json.load.
+
+    Only one chunk of the file and one player's stats are held at a time. Entries whose stats aren't an object are
+    skipped, as they always were.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = file.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer) or eof:
+                return
+            fill()
+
+    def expect(characters):
+        skip_whitespace()
+        if pos >= len(buffer) or buffer[pos] not in characters:
+            found = buffer[pos] if pos < len(buffer) else "end of file"
+            raise ValueError(f"Invalid player stats file: expected {' or '.join(map(repr, characters))}, found {found!r}")
+        return buffer[pos]
+
+    def decode():
+        nonlocal pos
+        skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            # A value that runs up to the end of the buffer may continue in the next chunk (e.g. a number)
+            if end == len(buffer) and not eof:
+                fill()
+                continue
+            pos = end
+            return value
+
+    expect("{")
+    pos += 1
+    if expect('}"') == "}":
+        return
+    while True:
+        name = decode()
+        expect(":")
+        pos += 1
+        stats = decode()
+        if isinstance(stats, dict):
+            yield name, stats
+        if expect(",}") == "}":
+            return
+        pos += 1
+
+
+def read_players(path, format=None):
+    """(name, stats) for every player in a stats file, the format is guessed from the extension if not given."""
+    format = format or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "json")
+    with open(path, "r", encoding="utf-8") as file:
+        if format == "jsonl":
+            yield from read_jsonl(file)
+        elif format == "json":
+            yield from read_legacy_json(file)
+        else:
+            raise ValueError(f"Unknown player stats format '{format}', expected 'json' or 'jsonl'")
+
+
+def write_jsonl(players, file):
+    """Write (name, stats) pairs as JSON Lines, returns the number of players written."""
+    count = 0
+    for name, stats in players:
+        file.write(json.dumps({"name": name, **stats}, ensure_ascii=False))
+        file.write("\n")
+        count += 1
+    return count
+
+
+def _write_legacy_json(path, players):
+    """A legacy player_stats.json with `players` generated players, written one entry at a time (for the benchmark)."""
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("{")
+        for i in range(players):
+            stats = {"high_score": (i * 7919) % 5000, "outstanding_score": i % 300, "games_played": 1 + i % 40,
+                     "last_played": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d} 12:00:00"}
+            file.write(f'{"," if i else ""}\n    {json.dumps(f"player-{i}")}: {json.dumps(stats)}')
+        file.write("\n}")
+
+
+def _benchmark(players):
+    """Import a legacy file of `players` players, export it as JSON Lines, then merge that back in."""
+    import os
+    import resource
+    import tempfile
+    import time
+
+    from stats_store import PlayerStatsStore
+
+    directory = tempfile.mkdtemp()
+    legacy_path = os.path.join(directory, "player_stats.json")
+    export_path = os.path.join(directory, "player_stats.jsonl")
+    _write_legacy_json(legacy_path, players)
+    print(f"Legacy file: {players:,} players, {os.path.getsize(legacy_path) / 1e6:.0f} MB")
+
+    def peak_mb():
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    store = PlayerStatsStore(os.path.join(directory, "player_stats.db"), legacy_path=None)
+    start = time.perf_counter()
+    imported = store.import_players(read_players(legacy_path), merge=False)
+    print(f"Import legacy JSON: {imported:,} players in {time.perf_counter() - start:.1f}s, peak memory {peak_mb():.0f} MB")
+
+    start = time.perf_counter()
+    with open(export_path, "w", encoding="utf-8") as file:
+        exported = write_jsonl(store.export_players(), file)
+    print(f"Export JSON Lines: {exported:,} players in {time.perf_counter() - start:.1f}s, peak memory {peak_mb():.0f} MB")
+
+    start = time.perf_counter()
+    merged = store.import_players(read_players(export_path), merge=True)
+    print(f"Merge JSON Lines: {merged:,} players in {time.perf_counter() - start:.1f}s, peak memory {peak_mb():.0f} MB")
+
+
+if __name__ == "__main__":
+    # if you directly run this file it will import, export or benchmark player stats files:
+    import argparse
+
+    from stats_store import PlayerStatsStore
+
+    parser = argparse.ArgumentParser(description="Stream player statistics in and out of player_stats.db")
+    parser.add_argument("--db", default="player_stats.db")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_command = commands.add_parser("import", help="import a .json (legacy) or .jsonl stats file")
+    import_command.add_argument("path")
+    import_command.add_argument("--format", choices=["json", "jsonl"])
+    import_command.add_argument("--replace", action="store_true", help="overwrite players instead of merging their stats")
+    export_command = commands.add_parser("export", help="write every player as JSON Lines")
+    export_command.add_argument("path")
+    bench_command = commands.add_parser("bench", help="benchmark import and export on a generated file")
+    bench_command.add_argument("--players", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        _benchmark(args.players)
+    elif args.command == "import":
+        store = PlayerStatsStore(args.db, legacy_path=None)
+        imported = store.import_players(read_players(args.path, args.format), merge=not args.replace)
+        print(f"Imported {imported} players, {len(store)} players in {store.path}")
+    else:
+        store = PlayerStatsStore(args.db, legacy_path=None)
+        with open(args.path, "w", encoding="utf-8") as file:
+            exported = write_jsonl(store.export_players(), file)
+        print(f"Exported {exported} players to {args.path}")
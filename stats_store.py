@@ -0,0 +1,499 @@
+'''Player statistics in an embedded SQLite database (player_stats.db) instead of one JSON file that is re-read and
+rewritten in full for every game: each player is a row keyed by name, so looking up a high score or recording a finished
+game touches one B-tree entry (O(log n)) whatever the number of players. An existing player_stats.json is imported once,
+the first time the database is opened. Writes are crash-safe and safe between processes: every transaction takes
+SQLite's write lock up front and commits atomically through the write-ahead log, and StatsWriter group-commits the games
+that finish together into one transaction (one fsync). The leaderboard is read from an index on high score plus a table
+of player counts per score range (a 16-way tree of counts over the scores), kept up to date by triggers, so a rank sums
+a few counts per level and a page walks down the tree to its first score, whatever the number of players or scores.
+Player names are also indexed case-insensitively, so a name prefix search is one range scan over the matching names.
+Every finished game is appended to a game history, and each player's best score per difficulty and day is kept in daily
+buckets, so "top scores of the last 7 days" reads a week of buckets instead of all history'''
+
+import itertools
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+DEFAULT_PATH = "player_stats.db"
+LEGACY_PATH = "player_stats.json"
+FIELDS = ("high_score", "outstanding_score", "games_played", "last_played")
+GAME_FIELDS = ("played_at", "name", "difficulty", "word", "score", "outstanding_score", "won", "wrong_guesses", "hints_used", "duration")
+IMPORT_BATCH = 10000  # Players handed to SQLite per executemany while importing
+DAY = 86400  # Seconds in a daily_best bucket (UTC days)
+BUSY_TIMEOUT = 30  # Seconds a writer waits for another process's transaction before giving up
+SCORE_BITS = 32  # High scores are signed 32-bit in the score_buckets tree (imports are clamped to that range)
+BUCKET_BITS = 4  # Each score_buckets range splits into 2 ** BUCKET_BITS ranges on the level below
+LEVELS = SCORE_BITS // BUCKET_BITS  # Level LEVELS is the root, counting everybody
+MIN_SCORE, MAX_SCORE = -2 ** (SCORE_BITS - 1), 2 ** (SCORE_BITS - 1) - 1
+
+# A high score's leaf in score_buckets, shifted so the lowest score is leaf 0
+_SCORE_KEY = f"({{score}} + {-MIN_SCORE})"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    high_score INTEGER NOT NULL DEFAULT 0,
+    outstanding_score INTEGER NOT NULL DEFAULT 0,
+    games_played INTEGER NOT NULL DEFAULT 0,
+    last_played TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS players_by_score ON players (high_score DESC, name);
+CREATE INDEX IF NOT EXISTS players_by_folded_name ON players (lower(name), name);
+-- Players per score range: (level, bucket) counts the scores whose leaf >> (level * BUCKET_BITS) is bucket, level 0 being
+-- single scores and level LEVELS everybody. score_levels holds each level's shift, for the triggers to join against
+CREATE TABLE IF NOT EXISTS score_buckets (
+    level INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    players INTEGER NOT NULL,
+    PRIMARY KEY (level, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS score_levels (
+    level INTEGER PRIMARY KEY,
+    shift INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    played_at INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    word TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    outstanding_score INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    wrong_guesses INTEGER NOT NULL,
+    hints_used INTEGER NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_player ON games (name, played_at);
+CREATE INDEX IF NOT EXISTS games_by_difficulty ON games (difficulty, played_at);
+CREATE TABLE IF NOT EXISTS daily_best (
+    difficulty TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (difficulty, day, name)
+) WITHOUT ROWID;
+-- The triggers run under the conflict policy of the statement that fired them, so no OR IGNORE / upserts in here
+CREATE TRIGGER IF NOT EXISTS score_buckets_insert AFTER INSERT ON players BEGIN
+    {add_new}
+END;
+CREATE TRIGGER IF NOT EXISTS score_buckets_update AFTER UPDATE OF high_score ON players
+WHEN old.high_score <> new.high_score BEGIN
+    {remove_old}
+    {add_new}
+END;
+CREATE TRIGGER IF NOT EXISTS score_buckets_delete AFTER DELETE ON players BEGIN
+    {remove_old}
+END;
+"""
+
+# One player in or out of every bucket on the path from a score's leaf to the root
+_ADD_TO_BUCKETS = """INSERT INTO score_buckets (level, bucket, players)
+        SELECT level, {key} >> shift, 0 FROM score_levels
+        WHERE NOT EXISTS (SELECT 1 FROM score_buckets WHERE score_buckets.level = score_levels.level AND bucket = {key} >> shift);
+    UPDATE score_buckets SET players = players + 1 WHERE (level, bucket) IN (SELECT level, {key} >> shift FROM score_levels);"""
+_REMOVE_FROM_BUCKETS = """UPDATE score_buckets SET players = players - 1 WHERE (level, bucket) IN (SELECT level, {key} >> shift FROM score_levels);
+    DELETE FROM score_buckets WHERE players = 0 AND (level, bucket) IN (SELECT level, {key} >> shift FROM score_levels);"""
+_SCHEMA = _SCHEMA.format(
+    add_new=_ADD_TO_BUCKETS.format(key=_SCORE_KEY.format(score="new.high_score")),
+    remove_old=_REMOVE_FROM_BUCKETS.format(key=_SCORE_KEY.format(score="old.high_score"))
+)
+
+# One finished game (see HangmanGame.stats_record): the best high score wins, everything else is the latest game's
+_RECORD_GAME = """
+INSERT INTO players (name, high_score, outstanding_score, games_played, last_played) VALUES (?, ?, ?, 1, ?)
+ON CONFLICT (name) DO UPDATE SET
+    high_score = MAX(high_score, excluded.high_score),
+    outstanding_score = excluded.outstanding_score,
+    games_played = games_played + 1,
+    last_played = excluded.last_played
+"""
+
+_RECORD_HISTORY = """
+INSERT INTO games (played_at, name, difficulty, word, score, outstanding_score, won, wrong_guesses, hints_used, duration)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_RECORD_DAILY_BEST = """
+INSERT INTO daily_best (difficulty, day, name, score) VALUES (?, ?, ?, ?)
+ON CONFLICT (difficulty, day, name) DO UPDATE SET score = MAX(score, excluded.score)
+"""
+
+# Best score per player in a window: whole days from the buckets, the partial first day from the games themselves
+_TOP_SCORES = """
+SELECT name, MAX(score) AS best FROM (
+    SELECT name, score FROM daily_best WHERE difficulty = ? AND day > ? AND day <= ?
+    UNION ALL
+    SELECT name, score FROM games WHERE difficulty = ? AND played_at >= ? AND played_at < ?
+) GROUP BY name ORDER BY best DESC, name LIMIT ?
+"""
+
+# Merged players combine with what is stored: best high score, summed games and the latest game's score and date
+_MERGE_PLAYER = """
+INSERT INTO players (name, high_score, outstanding_score, games_played, last_played) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET
+    high_score = MAX(high_score, excluded.high_score),
+    outstanding_score = CASE WHEN COALESCE(excluded.last_played, '') >= COALESCE(last_played, '')
+        THEN excluded.outstanding_score ELSE outstanding_score END,
+    games_played = games_played + excluded.games_played,
+    last_played = NULLIF(MAX(COALESCE(last_played, ''), COALESCE(excluded.last_played, '')), '')
+"""
+
+# Imported players replace what was stored under their name (an update, so the score_buckets triggers see it)
+_IMPORT_PLAYER = """
+INSERT INTO players (name, high_score, outstanding_score, games_played, last_played) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET
+    high_score = excluded.high_score,
+    outstanding_score = excluded.outstanding_score,
+    games_played = excluded.games_played,
+    last_played = excluded.last_played
+"""
+
+
+def _fold(name):
+    """Lower-case the way SQLite's lower() does (ASCII letters only), so prefixes line up with the name index."""
+    return "".join(char.lower() if char.isascii() else char for char in name)
+
+
+def _score_key(high_score):
+    return high_score - MIN_SCORE
+
+
+def _row_to_stats(row):
+    return {"high_score": row[1], "outstanding_score": row[2], "games_played": row[3], "last_played": row[4]}
+
+
+class PlayerStatsStore:
+    """Per-player statistics, safe to share between threads (each thread gets its own connection)."""
+
+    def __init__(self, path=DEFAULT_PATH, legacy_path=LEGACY_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+        self._build_score_buckets()
+        if legacy_path is not None:
+            self.migrate(legacy_path)
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # IMMEDIATE takes the write lock when a transaction starts, so two writers never deadlock upgrading a read lock
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level="IMMEDIATE")
+            # The write-ahead log makes every commit atomic (a crash mid-write leaves the last committed state) and lets
+            # readers carry on while a writer commits, FULL syncs it on every commit so a committed game survives power loss
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=FULL")
+            self._local.connection = connection
+        return connection
+
+    def _build_score_buckets(self):
+        """Fill score_buckets once for a database written before it existed (replacing the older score_counts table)."""
+        connection = self._connection()
+        if connection.execute("SELECT 1 FROM meta WHERE key = 'score_buckets'").fetchone():
+            return
+        connection.execute("BEGIN IMMEDIATE")
+        with connection:
+            if connection.execute("SELECT 1 FROM meta WHERE key = 'score_buckets'").fetchone():
+                return
+            for trigger in ("insert", "update", "delete"):
+                connection.execute(f"DROP TRIGGER IF EXISTS score_counts_{trigger}")
+            connection.execute("DROP TABLE IF EXISTS score_counts")
+            connection.execute("DELETE FROM score_levels")
+            connection.executemany(
+                "INSERT INTO score_levels (level, shift) VALUES (?, ?)", [(level, level * BUCKET_BITS) for level in range(LEVELS + 1)]
+            )
+            connection.execute("DELETE FROM score_buckets")
+            key = _SCORE_KEY.format(score="high_score")
+            connection.execute(
+                f"INSERT INTO score_buckets (level, bucket, players) SELECT level, {key} >> shift, COUNT(*) "
+                f"FROM players, score_levels GROUP BY level, {key} >> shift"
+            )
+            connection.execute("DELETE FROM meta WHERE key = 'score_counts'")
+            connection.execute("INSERT INTO meta (key, value) VALUES ('score_buckets', 'built')")
+
+    def migrate(self, legacy_path=LEGACY_PATH):
+        """Import a player_stats.json written by earlier versions, only once (returns the number of players imported)."""
+        connection = self._connection()
+        if connection.execute("SELECT 1 FROM meta WHERE key = 'migrated_from'").fetchone():
+            return 0
+        # Hold the write lock from the check to the import, so processes starting together import the file only once
+        connection.execute("BEGIN IMMEDIATE")
+        if connection.execute("SELECT 1 FROM meta WHERE key = 'migrated_from'").fetchone():
+            connection.rollback()
+            return 0
+        from stats_io import read_legacy_json  # stats_io builds on this module
+
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as file:
+                imported = self._import_rows(read_legacy_json(file), _IMPORT_PLAYER)
+        except FileNotFoundError:
+            imported = 0
+        except ValueError:
+            # Nothing from a damaged file is kept (json.JSONDecodeError is a ValueError too), and it isn't marked as
+            # migrated either, so it is imported once it has been fixed
+            connection.rollback()
+            print(f"Error: Invalid player stats file '{legacy_path}', nothing imported. Fix it and it will be imported next time.")
+            return 0
+        except BaseException:
+            connection.rollback()
+            raise
+
+        with connection:
+            connection.execute("INSERT INTO meta (key, value) VALUES ('migrated_from', ?)", (os.path.abspath(legacy_path),))
+        return imported
+
+    def _import_rows(self, players, statement, batch_size=IMPORT_BATCH):
+        """Feed (name, stats) pairs to statement in batches, inside the caller's transaction."""
+        connection = self._connection()
+        players = iter(players)
+        imported = 0
+        while True:
+            rows = [
+                (name, min(max(stats.get("high_score", 0), MIN_SCORE), MAX_SCORE), stats.get("outstanding_score", 0), stats.get("games_played", 0), stats.get("last_played"))
+                for name, stats in itertools.islice(players, batch_size)
+            ]
+            if not rows:
+                return imported
+            connection.executemany(statement, rows)
+            imported += len(rows)
+
+    def import_players(self, players, merge=True):
+        """Import (name, stats) pairs, e.g. from stats_io.read_players, in one transaction (returns how many).
+
+        With merge the stats are combined with what is already stored, as when merging several hosts' files: the best
+        high score wins, games played add up and the most recent game's outstanding score and date are kept. Without
+        it every imported player replaces the stored one.
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            imported = self._import_rows(players, _MERGE_PLAYER if merge else _IMPORT_PLAYER)
+        except BaseException:
+            connection.rollback()
+            raise
+        connection.commit()
+        return imported
+
+    def export_players(self):
+        """Every player's statistics as (name, stats) pairs in name order, streamed off the table."""
+        for row in self._connection().execute("SELECT * FROM players ORDER BY name"):
+            yield row[0], _row_to_stats(row)
+
+    def get(self, name):
+        """A player's statistics, or None if they never finished a game."""
+        row = self._connection().execute("SELECT * FROM players WHERE name = ?", (name,)).fetchone()
+        return _row_to_stats(row) if row else None
+
+    def search(self, prefix, limit=10):
+        """Players whose name starts with prefix, ignoring case, as (name, stats) pairs in name order."""
+        if limit < 1:
+            return []
+        prefix = _fold(prefix.strip())
+        if not prefix:
+            cursor = self._connection().execute("SELECT * FROM players ORDER BY lower(name), name LIMIT ?", (limit,))
+        else:
+            # Every name with the prefix sorts between the prefix and the prefix with its last character bumped
+            end = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            cursor = self._connection().execute(
+                "SELECT * FROM players WHERE lower(name) >= ? AND lower(name) < ? ORDER BY lower(name), name LIMIT ?",
+                (prefix, end, limit)
+            )
+        return [(row[0], _row_to_stats(row)) for row in cursor]
+
+    def high_score(self, name):
+        row = self._connection().execute("SELECT high_score FROM players WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    def record_games(self, records):
+        """Apply a batch of finished games in one transaction, records with a played_at are added to the history too."""
+        rows = [(record["name"], record["high_score"], record["outstanding_score"], record["last_played"]) for record in records]
+        games = [record for record in records if "played_at" in record]
+        with self._connection() as connection:
+            connection.executemany(_RECORD_GAME, rows)
+            if games:
+                connection.executemany(
+                    _RECORD_HISTORY, [(int(game["played_at"]), *(game[field] for field in GAME_FIELDS[1:])) for game in games]
+                )
+                connection.executemany(
+                    _RECORD_DAILY_BEST, [(game["difficulty"], int(game["played_at"]) // DAY, game["name"], game["score"]) for game in games]
+                )
+
+    def history(self, name, limit=20):
+        """A player's most recent games, newest first."""
+        cursor = self._connection().execute(
+            f"SELECT {', '.join(GAME_FIELDS)} FROM games WHERE name = ? ORDER BY played_at DESC, id DESC LIMIT ?", (name, limit)
+        )
+        return [dict(zip(GAME_FIELDS, row), won=bool(row[6])) for row in cursor]
+
+    def top_scores(self, difficulty, days=7, limit=10, now=None):
+        """The best score of each player who played difficulty in the last `days` days, as (name, score), best first.
+
+        Only the window's daily buckets are read, plus the games of the day the window starts in.
+        """
+        now = int(time.time() if now is None else now)
+        start = now - int(days * DAY)
+        start_day = start // DAY
+        cursor = self._connection().execute(
+            _TOP_SCORES, (difficulty, start_day, now // DAY, difficulty, start, (start_day + 1) * DAY, limit)
+        )
+        return cursor.fetchall()
+
+    def players(self):
+        """Every player's statistics as (name, stats) pairs, best high score first."""
+        cursor = self._connection().execute("SELECT * FROM players ORDER BY high_score DESC, name")
+        for row in cursor:
+            yield row[0], _row_to_stats(row)
+
+    def rank(self, name):
+        """A player's leaderboard rank (1 + the number of players with a higher score), or None if they never played."""
+        high_score = self._connection().execute("SELECT high_score FROM players WHERE name = ?", (name,)).fetchone()
+        return self._players_above(high_score[0]) + 1 if high_score else None
+
+    def _players_above(self, high_score):
+        """Players with a higher score than high_score: on each level, the ranges after its own within the same parent."""
+        leaf = _score_key(high_score)
+        ranges = []
+        for level in range(LEVELS):
+            bucket = leaf >> (level * BUCKET_BITS)
+            last_sibling = bucket | (2 ** BUCKET_BITS - 1)
+            if bucket < last_sibling:
+                ranges += [level, bucket + 1, last_sibling]
+        if not ranges:
+            return 0
+        # ORed equality/range terms, each answered from the primary key (a row-value IN list would scan the table)
+        row = self._connection().execute(
+            "SELECT COALESCE(SUM(players), 0) FROM score_buckets WHERE "
+            + " OR ".join(["(level = ? AND bucket BETWEEN ? AND ?)"] * (len(ranges) // 3)),
+            ranges
+        ).fetchone()
+        return row[0]
+
+    def top(self, k):
+        """The best k players as (rank, name, stats), read straight off the high score index."""
+        return self.page(1, k)
+
+    def page(self, number, size):
+        """One page of the leaderboard as (rank, name, stats), pages numbered from 1.
+
+        The score the page starts at is found by walking down score_buckets from the root, into the child range that
+        holds the page's first player on each level, then the rows are read from the index from there on. The cost is
+        a few bucket reads per level plus the page (and the players tied at its first score ahead of it).
+        """
+        if number < 1 or size < 1:
+            return []
+        connection = self._connection()
+        offset = (number - 1) * size
+        total = connection.execute("SELECT players FROM score_buckets WHERE level = ? AND bucket = 0", (LEVELS,)).fetchone()
+        if not total or offset >= total[0]:
+            return []
+        above = 0
+        bucket = 0
+        for level in range(LEVELS - 1, -1, -1):
+            children = connection.execute(
+                "SELECT bucket, players FROM score_buckets WHERE level = ? AND bucket BETWEEN ? AND ? ORDER BY bucket DESC",
+                (level, bucket << BUCKET_BITS, (bucket << BUCKET_BITS) | (2 ** BUCKET_BITS - 1))
+            )
+            for bucket, players in children:
+                if above + players > offset:
+                    break
+                above += players
+        high_score = bucket + MIN_SCORE
+
+        rows = connection.execute(
+            "SELECT * FROM players WHERE high_score = ? ORDER BY name LIMIT ? OFFSET ?", (high_score, size, offset - above)
+        ).fetchall()
+        if len(rows) < size:
+            rows += connection.execute(
+                "SELECT * FROM players WHERE high_score < ? ORDER BY high_score DESC, name LIMIT ?", (high_score, size - len(rows))
+            ).fetchall()
+
+        # Tied players share a rank, which is one more than the number of players with a higher score
+        page = []
+        rank = above + 1
+        for position, row in enumerate(rows, offset + 1):
+            if page and row[1] != page[-1][2]["high_score"]:
+                rank = position
+            page.append((rank, row[0], _row_to_stats(row)))
+        return page
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM players").fetchone()[0]
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class StatsWriter:
+    """Group commit for finished games: records submitted from any thread are applied by one writer thread, everything
+    queued while the previous transaction was committing goes into the next one, so a burst of game endings costs a
+    single transaction and fsync instead of one each"""
+
+    def __init__(self, store, max_batch=500):
+        self.store = store
+        self.max_batch = max_batch
+        self.commits = 0  # Transactions committed, compare with records_written to see the batching
+        self.records_written = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="stats-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record):
+        """Queue a finished game, the returned future completes once its transaction is committed."""
+        future = Future()
+        self._queue.put((record, future))
+        return future
+
+    def save(self, record, timeout=None):
+        """Record a finished game and wait until it is committed (raises whatever the commit raised)."""
+        return self.submit(record).result(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while batch[-1] is not None and len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is None
+            batch = [item for item in batch if item is not None]
+            if batch:
+                try:
+                    self.store.record_games([record for record, _ in batch])
+                except Exception as e:
+                    for _, future in batch:
+                        future.set_exception(e)
+                else:
+                    self.commits += 1
+                    self.records_written += len(batch)
+                    for _, future in batch:
+                        future.set_result(True)
+            if stop:
+                return
+
+    def close(self, timeout=None):
+        """Commit everything already submitted, then stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+
+if __name__ == "__main__":
+    # if you directly run this file it will migrate player_stats.json (or the file given) into player_stats.db:
+    import sys
+
+    store = PlayerStatsStore(legacy_path=None)
+    imported = store.migrate(sys.argv[1] if len(sys.argv) > 1 else LEGACY_PATH)
+    print(f"Imported {imported} players, {len(store)} players in {store.path}")
@@ -0,0 +1,100 @@
+'''Stress test for concurrent player stats writes: many processes, each with several threads finishing games through its
+own StatsWriter, record games for the same players at once. One writer is killed mid-run to simulate a crash. At the end
+every acknowledged game must be in the database, nothing may be counted twice and the database must pass an integrity
+check'''
+
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+from stats_store import PlayerStatsStore, StatsWriter
+
+
+def writer_main(path, process, threads, games, players, acknowledged):
+    """One writer process: `threads` threads each save `games` games and count the ones that were committed."""
+    store = PlayerStatsStore(path, legacy_path=None)
+    writer = StatsWriter(store)
+    committed = [0]
+    count_lock = threading.Lock()
+
+    def play(thread):
+        rng = random.Random(process * 1000 + thread)
+        for _ in range(games):
+            record = {
+                "name": f"player-{rng.randrange(players)}",
+                "high_score": rng.randrange(1000),
+                "outstanding_score": rng.randrange(1000),
+                "last_played": time.strftime("%Y-%m-%d %H:%M:%S")
+            }
+            writer.save(record)
+            with count_lock:
+                committed[0] += 1
+                acknowledged[process] = committed[0]
+
+    workers = [threading.Thread(target=play, args=(thread,)) for thread in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    writer.close()
+    store.close()
+
+
+def run(processes, threads, games, players, kill):
+    path = os.path.join(tempfile.mkdtemp(), "player_stats.db")
+    PlayerStatsStore(path, legacy_path=None).close()
+
+    context = multiprocessing.get_context("spawn")
+    acknowledged = context.Array("i", processes)
+    workers = [
+        context.Process(target=writer_main, args=(path, process, threads, games, players, acknowledged))
+        for process in range(processes)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    if kill:
+        # Wait until the victim has committed something, then kill it without letting it clean up
+        while acknowledged[0] == 0 and workers[0].is_alive():
+            time.sleep(0.01)
+        workers[0].kill()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    submitted = processes * threads * games
+    acked = sum(acknowledged)
+    connection = sqlite3.connect(path)
+    stored = connection.execute("SELECT COALESCE(SUM(games_played), 0) FROM players").fetchone()[0]
+    integrity = connection.execute("PRAGMA integrity_check").fetchone()[0]
+    connection.close()
+
+    print(f"{processes} processes x {threads} threads x {games} games on {players} players in {elapsed:.1f}s "
+          f"({stored / elapsed:.0f} games/s)")
+    print(f"Submitted {submitted} | acknowledged {acked} | stored {stored} | integrity {integrity}")
+
+    # A killed writer may have committed a batch it never acknowledged, but nothing acknowledged may be missing
+    expected_low = acked
+    expected_high = submitted if kill else acked
+    if integrity != "ok" or not expected_low <= stored <= expected_high or (not kill and stored != submitted):
+        print("FAILED: player stats updates were lost or corrupted")
+        return 1
+    print("OK: no updates lost")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--games", type=int, default=50, help="games per thread")
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--no-kill", action="store_true", help="let every writer finish instead of killing one")
+    args = parser.parse_args()
+    sys.exit(run(args.processes, args.threads, args.games, args.players, not args.no_kill))
@@ -0,0 +1,165 @@
+'''Hierarchical timer wheel that owns the game and turn deadlines of every running session,
+arming and cancelling a deadline is O(1) and a single thread (or asyncio task) drives them all'''
+
+import asyncio
+import math
+import threading
+import time
+
+
+class Timer:
+    """A deadline armed on a TimerWheel, cancel() it once it's no longer needed."""
+    __slots__ = ("expires", "callback", "args", "slot", "fired", "_lock")
+
+    def __init__(self, expires, callback, args, lock):
+        self.expires = expires  # Absolute tick the timer is due on
+        self.callback = callback
+        self.args = args
+        self._lock = lock  # The owning wheel's lock
+        self.slot = None  # The wheel slot (a set) currently holding this timer
+        self.fired = False
+
+    def cancel(self):
+        """Disarm the timer, returns False if it already fired or was cancelled."""
+        with self._lock:
+            slot = self.slot
+            if slot is None:
+                return False
+            slot.discard(self)
+            self.slot = None
+            return True
+
+    @property
+    def active(self):
+        return self.slot is not None
+
+
+class TimerWheel:
+    """Deadlines are hashed into levels of slot rings, each level spanning slots times the previous one.
+
+    A timer sits in the lowest level whose current rotation contains its deadline and is cascaded down
+    a level whenever the wheel reaches its slot, so every timer is touched at most once per level.
+    """
+
+    def __init__(self, tick=0.1, slot_bits=8, levels=4):
+        self.tick = tick  # Seconds per tick (the resolution of every deadline)
+        self.slot_bits = slot_bits
+        self.slot_mask = (1 << slot_bits) - 1
+        self.levels = [[set() for _ in range(1 << slot_bits)] for _ in range(levels)]
+        self.current_tick = 0
+        self.started = time.monotonic()
+        self.fired_count = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        """Number of armed timers."""
+        with self._lock:
+            return sum(len(slot) for level in self.levels for slot in level)
+
+    def _place(self, timer):
+        """Put a timer in the lowest level whose current rotation contains its deadline."""
+        for level, slots in enumerate(self.levels):
+            shift = self.slot_bits * level
+            if level == len(self.levels) - 1 or timer.expires >> (shift + self.slot_bits) == self.current_tick >> (shift + self.slot_bits):
+                slot = slots[(timer.expires >> shift) & self.slot_mask]
+                slot.add(timer)
+                timer.slot = slot
+                return
+
+    def schedule(self, delay, callback, *args):
+        """Call callback(*args) once delay seconds have passed, returns the Timer so it can be cancelled."""
+        with self._lock:
+            # Never fire early: round up to the next whole tick, and a tick that already started doesn't count
+            expires = self.current_tick + max(1, math.ceil(delay / self.tick))
+            timer = Timer(expires, callback, args, self._lock)
+            self._place(timer)
+        return timer
+
+    def advance(self, now=None):
+        """Move the wheel up to now (a time.monotonic() value) and run the callbacks of every timer that came due."""
+        if now is None:
+            now = time.monotonic()
+        target_tick = int((now - self.started) / self.tick)
+
+        due = []
+        with self._lock:
+            while self.current_tick < target_tick:
+                self.current_tick += 1
+
+                # Cascade the slots the wheel just reached on the upper levels, highest first
+                for level in range(len(self.levels) - 1, 0, -1):
+                    shift = self.slot_bits * level
+                    if self.current_tick & ((1 << shift) - 1):
+                        continue
+                    slot = self.levels[level][(self.current_tick >> shift) & self.slot_mask]
+                    timers = list(slot)
+                    slot.clear()
+                    for timer in timers:
+                        self._place(timer)
+
+                slot = self.levels[0][self.current_tick & self.slot_mask]
+                for timer in list(slot):
+                    if timer.expires <= self.current_tick:
+                        slot.discard(timer)
+                        timer.slot = None
+                        timer.fired = True
+                        due.append(timer)
+
+        # Callbacks run outside the lock so they are free to arm or cancel timers
+        for timer in due:
+            self.fired_count += 1
+            try:
+                timer.callback(*timer.args)
+            except Exception as e:
+                print(f"Error in timer callback: {e}")
+        return len(due)
+
+    def _run(self):
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            self.advance()
+            next_tick += self.tick
+            self._stop.wait(max(0, next_tick - time.monotonic()))
+
+    def start(self):
+        """Start the one scheduler thread that serves every session."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="timer-wheel", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    async def run_async(self):
+        """Drive the wheel from an asyncio task instead, callbacks then run on the event loop."""
+        next_tick = time.monotonic()
+        while True:
+            self.advance()
+            next_tick += self.tick
+            await asyncio.sleep(max(0, next_tick - time.monotonic()))
+
+
+if __name__ == "__main__":
+    # if you directly run this file it will arm and cancel a large batch of game and turn deadlines:
+    import random
+
+    wheel = TimerWheel(tick=0.01)
+    fired = []
+    timers = [wheel.schedule(random.uniform(0.01, 2.0), fired.append, i) for i in range(100000)]
+
+    start = time.perf_counter()
+    for timer in timers[::2]:
+        timer.cancel()
+    print(f"Cancelled 50000 timers in {time.perf_counter() - start:.3f}s")
+
+    wheel.start()
+    time.sleep(2.2)
+    wheel.stop()
+    print(f"Fired {len(fired)} of the 50000 timers left armed, {len(wheel)} still pending")
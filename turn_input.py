@@ -0,0 +1,112 @@
+'''Deadline-aware terminal input for the turn clock: a single selector loop waits for the player's line and redraws the countdown,
+so a turn really ends at its time limit without a timer thread per turn. Every prompt of the terminal game reads through
+here (with no deadline outside the turn clock), so lines the player typed ahead are answered in order and never lost'''
+
+import os
+import selectors
+import sys
+import time
+
+# Bytes the player typed past the end of the line we returned (e.g. pasted input), kept for the next prompt
+_pending = b""
+
+
+def _countdown(remaining):
+    if remaining == float("inf"):
+        return ""
+    return f"[Time: {int(remaining + 0.999):>3}s] "
+
+
+def _redraw(remaining):
+    """Rewrite only the countdown at the start of the prompt line, leaving the cursor where the player is typing."""
+    # \0337 / \0338 save and restore the cursor position
+    sys.stdout.write(f"\0337\r{_countdown(remaining)}\0338")
+    sys.stdout.flush()
+
+
+def _blocking_input(prompt, deadline):
+    """Fallback for input that can't be polled (Windows, pipes, replaced stdin): the deadline is only checked after Enter."""
+    line = input(_countdown(deadline - time.time()) + prompt)
+    if time.time() >= deadline:
+        return None
+    return line
+
+
+def _pending_line():
+    global _pending
+
+    line, _, _pending = _pending.partition(b"\n")
+    return line.decode(sys.stdin.encoding or "utf-8", errors="replace").rstrip("\r")
+
+
+def timed_input(prompt, deadline=None, redraw_interval=1.0):
+    """Read a line from the player, returns None if deadline (a time.time() value) passes first. Without a deadline
+    it waits for as long as the player takes, like input()."""
+    global _pending
+
+    if deadline is None:
+        deadline = float("inf")
+    if b"\n" in _pending and time.time() < deadline:  # Typed ahead during an earlier prompt
+        sys.stdout.write(_countdown(deadline - time.time()) + prompt)
+        sys.stdout.flush()
+        return _pending_line()
+
+    try:
+        fd = sys.stdin.fileno()
+    except (AttributeError, OSError, ValueError):
+        return _blocking_input(prompt, deadline)
+    # select() only works on sockets on Windows, and piped input may already sit in sys.stdin's own buffer
+    if os.name == "nt" or not sys.stdin.isatty():
+        return _blocking_input(prompt, deadline)
+
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        return None
+
+    sys.stdout.write(_countdown(remaining) + prompt)
+    sys.stdout.flush()
+    # Only a terminal can have its countdown redrawn in place
+    next_redraw = time.time() + redraw_interval if sys.stdout.isatty() else float("inf")
+
+    was_blocking = os.get_blocking(fd)
+    os.set_blocking(fd, False)
+    selector = selectors.DefaultSelector()
+    selector.register(fd, selectors.EVENT_READ)
+    try:
+        while b"\n" not in _pending:
+            now = time.time()
+            remaining = deadline - now
+            if remaining <= 0:
+                print()
+                return None
+
+            if now >= next_redraw:
+                _redraw(remaining)
+                next_redraw = now + redraw_interval
+
+            # Sleep until the player types something, the next redraw or the deadline, whichever comes first
+            timeout = min(remaining, max(0, next_redraw - now))
+            if not selector.select(None if timeout == float("inf") else timeout):
+                continue
+
+            try:
+                chunk = os.read(fd, 4096)
+            except BlockingIOError:
+                continue
+
+            if not chunk:  # End of input
+                if _pending:
+                    break
+                raise EOFError
+            _pending += chunk
+    finally:
+        selector.close()
+        os.set_blocking(fd, was_blocking)
+
+    return _pending_line()
+
+
+if __name__ == "__main__":
+    # if you directly run this file it will give you 10 seconds to type something:
+    answer = timed_input("Type something: ", time.time() + 10)
+    print("Timed out!" if answer is None else f"You typed: {answer!r}")
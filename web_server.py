@@ -0,0 +1,191 @@
+'''Flask front-end for the game engine: the play_game loop exposed as JSON endpoints. Each worker process runs one
+GameEngine on a background event loop, shares the cached word dictionary and keeps its sessions in a bounded, idle-evicting store.
+
+Install the dependencies with `pip install -r requirements.txt`, then run it with `python web_server.py` or under a WSGI
+server, e.g. `gunicorn -w 4 "web_server:create_app()"` (sessions live in the worker that created them, so multi-worker
+deployments need session affinity on the session id). With `--shards N` / `create_app(shards=N)` the games run in N
+shard processes instead (see shard_server.py).
+
+An action posted with `?stream=1` is answered as newline-delimited JSON: {"chunk": ...} lines with Gemini's text as it
+streams in (hints, resignations), then the usual result with "first_chunk_ms" added. Sharded engines send the result alone.
+If the engine goes quiet for ACTION_TIMEOUT seconds mid-stream, the body ends with an {"error": ...} line instead.'''
+
+import argparse
+import asyncio
+import json
+import queue
+import threading
+import time
+
+from flask import Flask, Response, jsonify, request
+
+from game_engine import ACTIONS, GameEngine
+from hangman_game import DIFFICULTY_LEVELS, player_stats_store
+from shard_server import ShardedEngine
+from timer_wheel import TimerWheel
+
+ACTION_TIMEOUT = 30  # Seconds a request may wait on the engine (Gemini calls included)
+
+
+class EngineRunner:
+    """A GameEngine on its own event loop thread, so synchronous WSGI handlers can await it."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name="game-engine", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.create_task(self.engine.run())
+        self.loop.run_forever()
+
+    def call(self, coroutine, timeout=ACTION_TIMEOUT):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+
+def create_app(max_sessions=10000, idle_timeout=1800, shards=0):
+    """Build the Flask app with its own engine (one per worker process), or a dispatcher over shard processes."""
+    app = Flask(__name__)
+    stats = player_stats_store()
+    def timed_out():
+        return {"error": f"No reply from the game engine within {ACTION_TIMEOUT} s"}
+
+    streams = {}  # Session id -> queue of Gemini chunks for the client streaming that session's current action
+
+    def stream_chunk(session_id, chunk):
+        chunks = streams.get(session_id)
+        if chunks is not None:
+            chunks.put(chunk)
+
+    if shards:
+        engine = ShardedEngine(shards, max_sessions=max_sessions, idle_timeout=idle_timeout)
+    else:
+        engine = GameEngine(
+            wheel=TimerWheel(),
+            max_sessions=max_sessions,
+            idle_timeout=idle_timeout,
+            high_score_lookup=stats.high_score,
+            on_stream=stream_chunk
+        )
+    runner = EngineRunner(engine)
+    app.config["ENGINE_RUNNER"] = runner
+
+    @app.errorhandler(KeyError)
+    def unknown_session(error):
+        return jsonify({"error": error.args[0] if error.args else "Not found"}), 404
+
+    @app.errorhandler(ValueError)
+    def bad_request(error):
+        return jsonify({"error": str(error)}), 400
+
+    @app.get("/health")
+    def health():
+        return jsonify({"status": "ok", **engine.status()})
+
+    @app.post("/sessions")
+    def create_session():
+        """Body: {"name": ..., "difficulty": "easy" | ... | "master"}, starts the game right away."""
+        body = request.get_json(silent=True) or {}
+        difficulty = str(body.get("difficulty", "easy")).lower()
+        if difficulty not in DIFFICULTY_LEVELS.values() or difficulty == "creator":
+            raise ValueError(f"Unknown difficulty '{difficulty}'")
+
+        session_id, _ = runner.call(engine.create_session(str(body.get("name", "")), difficulty))
+        result = runner.call(engine.submit(session_id, "start"))
+        return jsonify({"session_id": session_id, **result}), 201
+
+    @app.get("/sessions/<session_id>")
+    def get_session(session_id):
+        return jsonify(runner.call(engine.get_state(session_id)))
+
+    @app.post("/sessions/<session_id>/actions")
+    def submit_action(session_id):
+        """Body: {"action": "letter" | "word" | "hint" | "resign" | "timeout", "value": ...}"""
+        body = request.get_json(silent=True) or {}
+        action = body.get("action")
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action '{action}', expected one of: {', '.join(ACTIONS)}")
+        if not request.args.get("stream"):
+            return jsonify(runner.call(engine.submit(session_id, action, body.get("value"))))
+
+        start = time.perf_counter()
+        chunks = streams[session_id] = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(engine.submit(session_id, action, body.get("value")), runner.loop)
+        future.add_done_callback(lambda _: chunks.put(None))
+        try:
+            first = chunks.get(timeout=ACTION_TIMEOUT)
+        except queue.Empty:
+            streams.pop(session_id, None)
+            future.cancel()
+            return jsonify(timed_out()), 504
+        if first is None:  # Nothing streamed (or an error, answered like any other request's)
+            streams.pop(session_id, None)
+            return jsonify({**future.result(), "first_chunk_ms": None})
+        first_chunk_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        def events(chunk):
+            try:
+                while chunk is not None:
+                    yield json.dumps({"chunk": chunk}) + "\n"
+                    chunk = chunks.get(timeout=ACTION_TIMEOUT)
+                yield json.dumps({**future.result(), "first_chunk_ms": first_chunk_ms}) + "\n"
+            except queue.Empty:  # The response has started, so the error goes in the body as its last record
+                future.cancel()
+                yield json.dumps(timed_out()) + "\n"
+            finally:
+                streams.pop(session_id, None)
+
+        return Response(events(first), mimetype="application/x-ndjson")
+
+    @app.delete("/sessions/<session_id>")
+    def delete_session(session_id):
+        runner.loop.call_soon_threadsafe(engine.close_session, session_id)
+        return "", 204
+
+    @app.get("/leaderboard")
+    def leaderboard():
+        limit = request.args.get("limit", 10, type=int)
+        page = request.args.get("page", 1, type=int)
+        return jsonify([{"rank": rank, "name": name, **player} for rank, name, player in stats.page(page, min(limit, 100))])
+
+    @app.get("/leaderboard/recent")
+    def recent_leaderboard():
+        difficulty = request.args.get("difficulty", "easy")
+        if difficulty not in DIFFICULTY_LEVELS.values():
+            raise ValueError(f"Unknown difficulty '{difficulty}'")
+        days = request.args.get("days", 7, type=float)
+        limit = request.args.get("limit", 10, type=int)
+        scores = stats.top_scores(difficulty, days, min(limit, 100))
+        return jsonify([{"rank": rank, "name": name, "score": score} for rank, (name, score) in enumerate(scores, 1)])
+
+    @app.get("/players")
+    def search_players():
+        limit = request.args.get("limit", 10, type=int)
+        players = stats.search(request.args.get("prefix", ""), min(limit, 100))
+        return jsonify([{"name": name, **player} for name, player in players])
+
+    @app.get("/players/<name>")
+    def player(name):
+        player = stats.get(name)
+        if player is None:
+            raise KeyError(f"Unknown player '{name}'")
+        return jsonify({"name": name, "rank": stats.rank(name), **player})
+
+    @app.get("/players/<name>/history")
+    def player_history(name):
+        limit = request.args.get("limit", 20, type=int)
+        return jsonify(stats.history(name, min(limit, 100)))
+
+    return app
+
+
+if __name__ == "__main__":
+    # if you directly run this file it will serve the game with Flask's threaded server:
+    parser = argparse.ArgumentParser(description="Hangman game web server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--shards", type=int, default=0, help="game worker processes (0 runs the games in this process)")
+    args = parser.parse_args()
+    create_app(shards=args.shards).run(host=args.host, port=args.port, threaded=True)
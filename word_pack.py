@@ -0,0 +1,250 @@
+'''Dictionary compiler: dedupes and validates the word lists of a dictionary.json, then writes them as a binary word pack
+(a string table plus an offset array per difficulty) that load_word_dictionary memory-maps instead of parsing, so a
+process can start on hundreds of thousands of words without paying for a JSON parse.
+
+Pack layout (little-endian): b"HWPK", version (u32), metadata length (u32), metadata JSON (every tier's settings plus
+the index range of its words), padding to 4 bytes, (words + 1) u32 offsets into the string table, then the UTF-8 string
+table itself. Word i of the pack is strings[offsets[i]:offsets[i + 1]]'''
+
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from types import MappingProxyType
+
+MAGIC = b"HWPK"
+VERSION = 1
+_HEADER = struct.Struct("<4sII")
+_LIST_KEYS = ("words", "phrases")
+_ENTRY = re.compile(r"[a-z]+( [a-z]+)*")  # Lower-case letters, single spaces between the words of a phrase
+
+
+class PackedWords(Sequence):
+    """One difficulty's words, decoded from the memory-mapped string table only when they are read."""
+
+    def __init__(self, pack, start, count):
+        self._pack = pack
+        self._start = start
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("word index out of range")
+        return self._pack.word(self._start + index)
+
+    def __repr__(self):
+        return f"PackedWords({self._count} words)"
+
+
+class WordPack:
+    """A memory-mapped word pack. The file may be replaced (renamed over) while mapped, the mapping keeps the old one."""
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, metadata_length = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a word pack")
+        if version != VERSION:
+            raise ValueError(f"Unsupported word pack version {version} in '{path}'")
+
+        metadata_start = _HEADER.size
+        self.metadata = json.loads(self._map[metadata_start:metadata_start + metadata_length])
+        offsets_start = _aligned(metadata_start + metadata_length)
+        offsets_end = offsets_start + (self.metadata["words"] + 1) * 4
+        if sys.byteorder == "little":
+            self._offsets = memoryview(self._map)[offsets_start:offsets_end].cast("I")
+        else:
+            self._offsets = array("I", self._map[offsets_start:offsets_end])
+            self._offsets.byteswap()
+        self._strings = offsets_end
+
+    def __len__(self):
+        return self.metadata["words"]
+
+    def word(self, index):
+        start = self._strings + self._offsets[index]
+        end = self._strings + self._offsets[index + 1]
+        return self._map[start:end].decode("utf-8")
+
+    def dictionary(self):
+        """The pack as a read-only dictionary shaped like dictionary.json (word lists are PackedWords)."""
+        tiers = {}
+        for name, tier in self.metadata["tiers"].items():
+            settings = {key: _freeze(value) for key, value in tier["settings"].items()}
+            settings[tier["list"]] = PackedWords(self, tier["start"], tier["count"])
+            tiers[name] = MappingProxyType(settings)
+        return MappingProxyType(tiers)
+
+
+def _aligned(position):
+    return (position + 3) & ~3
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def is_word_pack(path):
+    try:
+        with open(path, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _length_range(word_length):
+    """(lowest, highest) letters from a declared word_length such as "5-8 letters", None if it declares no range."""
+    match = re.match(r"\s*(\d+)\s*-\s*(\d+)", str(word_length))
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+def compile_dictionary(source):
+    """Dedupe and validate a dictionary, returns (dictionary, errors, warnings).
+
+    Entries are normalised (lower case, single spaces) and only the first of any duplicates is kept. Errors are entries
+    that can't be played (not text, or characters other than letters and spaces), they are dropped. Warnings are
+    duplicates and entries whose letter count is outside the tier's declared word_length range.
+    """
+    dictionary, errors, warnings = {}, [], []
+    for name, tier in source.items():
+        list_key = next((key for key in _LIST_KEYS if key in tier), None)
+        if list_key is None:
+            errors.append(f"{name}: no 'words' or 'phrases' list")
+            continue
+        length_range = _length_range(tier.get("word_length"))
+
+        seen, entries = set(), []
+        for entry in tier[list_key]:
+            if not isinstance(entry, str):
+                errors.append(f"{name}: {entry!r} is not text")
+                continue
+            word = " ".join(entry.lower().split())
+            if not _ENTRY.fullmatch(word):
+                errors.append(f"{name}: {entry!r} has characters other than letters and spaces")
+                continue
+            if word in seen:
+                warnings.append(f"{name}: duplicate {word!r} removed")
+                continue
+            seen.add(word)
+            letters = len(word) - word.count(" ")
+            if length_range and not length_range[0] <= letters <= length_range[1]:
+                warnings.append(f"{name}: {word!r} has {letters} letters, outside {tier['word_length']}")
+            entries.append(word)
+
+        dictionary[name] = {key: value for key, value in tier.items() if key not in _LIST_KEYS}
+        dictionary[name][list_key] = entries
+    return dictionary, errors, warnings
+
+
+def write_word_pack(path, dictionary):
+    """Write a dictionary as a word pack, through a temporary file renamed into place (safe for mapped readers)."""
+    tiers, offsets, strings = {}, array("I", [0]), bytearray()
+    for name, tier in dictionary.items():
+        list_key = next(key for key in _LIST_KEYS if key in tier)
+        words = tier[list_key]
+        tiers[name] = {
+            "settings": {key: value for key, value in tier.items() if key != list_key},
+            "list": list_key,
+            "start": len(offsets) - 1,
+            "count": len(words)
+        }
+        for word in words:
+            strings += word.encode("utf-8")
+            offsets.append(len(strings))
+    if sys.byteorder != "little":
+        offsets.byteswap()
+
+    metadata = json.dumps({"words": len(offsets) - 1, "tiers": tiers}, separators=(",", ":")).encode("utf-8")
+    padding = _aligned(_HEADER.size + len(metadata)) - _HEADER.size - len(metadata)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, len(metadata)))
+        file.write(metadata)
+        file.write(b"\0" * padding)
+        file.write(offsets.tobytes())
+        file.write(strings)
+    os.replace(temporary_path, path)
+
+
+def _benchmark(words):
+    """Time loading a dictionary of `words` generated words from JSON and from a word pack."""
+    import random
+    import string
+    import tempfile
+    import time
+
+    rng = random.Random(1)
+    source = {
+        tier: {"attempts": 9, "word_length": "any", "words": ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 14))) for _ in range(words // 5)]}
+        for tier in ("easy", "medium", "hard", "challenger", "master")
+    }
+    directory = tempfile.mkdtemp()
+    json_path, pack_path = os.path.join(directory, "dictionary.json"), os.path.join(directory, "dictionary.pack")
+    with open(json_path, "w") as file:
+        json.dump(source, file)
+    write_word_pack(pack_path, source)
+
+    def best_of(load, runs=5):
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            rng.choice(load()["hard"]["words"])
+            times.append(time.perf_counter() - start)
+        return min(times) * 1000
+
+    def load_json():
+        with open(json_path) as file:
+            return json.load(file)
+
+    print(f"{words:,} words | JSON {os.path.getsize(json_path) / 1e6:.1f} MB, pack {os.path.getsize(pack_path) / 1e6:.1f} MB")
+    print(f"Load and pick a word: JSON {best_of(load_json):.1f} ms | word pack {best_of(lambda: WordPack(pack_path).dictionary()):.2f} ms")
+
+
+if __name__ == "__main__":
+    # if you directly run this file it will compile a dictionary.json into a word pack:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Dedupe, validate and pack a dictionary.json")
+    parser.add_argument("source", nargs="?", default="dictionary.json")
+    parser.add_argument("-o", "--output", default="dictionary.pack")
+    parser.add_argument("--json", help="also write the cleaned dictionary as compact JSON to this path")
+    parser.add_argument("--strict", action="store_true", help="fail on warnings (duplicates, lengths outside the declared range)")
+    parser.add_argument("--bench", type=int, metavar="WORDS", help="benchmark JSON against a word pack of WORDS words instead")
+    args = parser.parse_args()
+
+    if args.bench:
+        _benchmark(args.bench)
+        sys.exit(0)
+
+    with open(args.source, "r", encoding="utf-8") as file:
+        compiled, errors, warnings = compile_dictionary(json.load(file))
+    for problem in errors:
+        print(f"Error: {problem}")
+    for problem in warnings:
+        print(f"Warning: {problem}")
+    if errors or (args.strict and warnings):
+        print(f"{len(errors)} errors, {len(warnings)} warnings, nothing written")
+        sys.exit(1)
+
+    write_word_pack(args.output, compiled)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(compiled, file, separators=(",", ":"))
+    total = sum(len(tier.get("words", tier.get("phrases", []))) for tier in compiled.values())
+    print(f"Packed {total} words into {args.output} ({len(warnings)} warnings)")